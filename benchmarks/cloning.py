@@ -0,0 +1,69 @@
+# encoding: utf-8
+
+"""
+Duplication time of every slide of a freshly loaded deck, with and without
+cloning their slide masters (along with all the layouts and themes these bring
+along) - through the worklist |Cloner| as well as through |_Recursive|, which
+traverses the relationship graph recursively, as |Cloner| used to.
+
+Usage: python benchmarks/cloning.py [path.pptx] [rounds]
+"""
+
+import os, sys, time
+
+dirname = os.path.dirname(__file__)
+sys.path.insert(0, os.path.normpath(os.path.join(dirname, '..')))
+
+from pptx import Presentation
+import pptxpy
+from pptxpy import cloning
+from pptxpy.common import Part, _void
+
+
+class _Recursive(cloning.Cloner):
+  """
+  |Cloner| cloning the relationships of each part within the very call cloning
+  the part - rather than through the worklist - thus in the same order.
+  """
+  def _visit(self, dest, src, link=None):
+    super()._visit(dest, src, link)
+    dest, src, rels, link = self._work.pop()
+    ct = src.content_type if src else None
+    for rel in rels:
+      if rel.reltype not in Part._closed.get(ct, _void):
+        self._clone(dest, rel, src)
+
+    if link is not None:
+      self._link(*link)
+
+
+def duplicate(uri, rounds, slide_master):
+  elapsed = count = 0
+  for _ in range(rounds):
+    prs = Presentation(uri)
+    slides = prs.slides
+    start = time.perf_counter()
+    for i in range(len(slides)):
+      slides.duplicate(i, slide_master=slide_master)
+    elapsed += time.perf_counter() - start
+    count += i + 1
+  return elapsed, count
+
+
+def main(uri, rounds=20):
+  worklist = cloning.Cloner
+  for cloner in (worklist, _Recursive):
+    cloning.Cloner = cloner
+    try:
+      for name, slide_master in [('slides', False), ('masters', True)]:
+        elapsed, count = min(duplicate(uri, rounds, slide_master) for _ in range(3))
+        label = '%s/%s' % (name, 'worklist' if cloner is worklist else 'recursive')
+        print('%-18s %8.2f ms/slide' % (label, elapsed / count * 1000))
+    finally:
+      cloning.Cloner = worklist
+
+
+if __name__ == '__main__':
+  default = os.path.join(dirname, '../tests/test_files/test_slides.pptx')
+  uri = sys.argv[1] if len(sys.argv) > 1 else default
+  main(uri, *map(int, sys.argv[2:3]))
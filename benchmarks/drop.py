@@ -0,0 +1,44 @@
+# encoding: utf-8
+
+"""
+Time taken by |Part.drop_all| to drop all slides from the presentation part of a
+deck built from a |Template| - as |Template| itself does upon loading its source.
+
+Usage: python benchmarks/drop.py [path.pptx] [slides]
+"""
+
+import io, os, sys, time
+
+dirname = os.path.dirname(__file__)
+sys.path.insert(0, os.path.normpath(os.path.join(dirname, '..')))
+
+from pptx import Presentation
+from pptxpy import Template
+from pptxpy.common import RT
+
+
+def main(uri, count=500):
+  template = Template(uri)
+  prs = template()
+  model = range(len(template))
+  while len(prs.slides) < count:
+    prs.slides.instantiate_many(model[:count - len(prs.slides)])
+
+  blob = io.BytesIO()
+  prs.save(blob)
+
+  elapsed = []
+  for _ in range(3):
+    blob.seek(0)
+    part = Presentation(blob).part
+    start = time.perf_counter()
+    part.drop_all(RT.SLIDE, { RT.COMMENT_AUTHORS, RT.PRES_PROPS })
+    elapsed.append(time.perf_counter() - start)
+
+  print('%d slides %8.2f ms' % (count, min(elapsed) * 1000))
+
+
+if __name__ == '__main__':
+  default = os.path.join(dirname, '../tests/test_files/test_slides.pptx')
+  uri = sys.argv[1] if len(sys.argv) > 1 else default
+  main(uri, *map(int, sys.argv[2:3]))
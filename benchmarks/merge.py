@@ -0,0 +1,47 @@
+# encoding: utf-8
+
+"""
+Time taken and peak memory traced while merging as many copies of a deck -
+through |merge| versus keeping every source loaded and importing their slides
+into the first one (see |Slides.import_many|).
+
+Usage: python benchmarks/merge.py [path.pptx] [decks]
+"""
+
+import io, os, sys, time, tracemalloc
+
+dirname = os.path.dirname(__file__)
+sys.path.insert(0, os.path.normpath(os.path.join(dirname, '..')))
+
+from pptx import Presentation
+import pptxpy
+
+
+def merge(paths):
+  pptxpy.merge(paths, io.BytesIO())
+
+
+def load_all(paths):
+  sources = [Presentation(path) for path in paths]
+  prs = sources[0]
+  for src in sources[1:]:
+    prs.slides.import_many(list(src.slides))
+  prs.save(io.BytesIO())
+
+
+def main(uri, count=50):
+  paths = [uri] * count
+  for name, run in [('merge', merge), ('load_all', load_all)]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    run(paths)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print('%-10s %8.2f s %8.1f MB' % (name, elapsed, peak / 2**20))
+
+
+if __name__ == '__main__':
+  default = os.path.join(dirname, '../tests/test_files/test_slides.pptx')
+  uri = sys.argv[1] if len(sys.argv) > 1 else default
+  main(uri, *map(int, sys.argv[2:3]))
@@ -0,0 +1,45 @@
+# encoding: utf-8
+
+"""
+Time taken by |Part.relate_to| to relate the presentation part of a deck to as
+many new slide parts, then - once every other relationship has been dropped - to
+each of them again, filling the gaps in numbering.
+
+Usage: python benchmarks/relate.py [path.pptx] [slides]
+"""
+
+import os, sys, time
+
+dirname = os.path.dirname(__file__)
+sys.path.insert(0, os.path.normpath(os.path.join(dirname, '..')))
+
+from pptx import Presentation
+import pptxpy
+from pptxpy.common import RT
+
+
+def main(uri, count=5000):
+  prs = Presentation(uri)
+  part = prs.part
+  slide_part = prs.slides[0].part
+  targets = [slide_part._clone(slide_part.partname) for _ in range(count)]
+
+  start = time.perf_counter()
+  rIds = [part.relate_to(target, RT.SLIDE) for target in targets]
+  elapsed = time.perf_counter() - start
+  print('%-10s %8.2f ms' % ('relate', elapsed * 1000))
+
+  for rId in rIds[::2]:
+    part.drop_rel(rId)
+
+  start = time.perf_counter()
+  for target in targets:
+    part.relate_to(target, RT.SLIDE)
+  elapsed = time.perf_counter() - start
+  print('%-10s %8.2f ms' % ('refill', elapsed * 1000))
+
+
+if __name__ == '__main__':
+  default = os.path.join(dirname, '../tests/test_files/test_slides.pptx')
+  uri = sys.argv[1] if len(sys.argv) > 1 else default
+  main(uri, *map(int, sys.argv[2:3]))
@@ -0,0 +1,39 @@
+# encoding: utf-8
+
+"""
+Save time of a 1,000-slide deck built from a |Template| - the regular writer
+versus streaming saves, sequential and with a pool of *workers*.
+
+Usage: python benchmarks/save.py [path.pptx] [slides]
+"""
+
+import io, os, sys, time
+
+dirname = os.path.dirname(__file__)
+sys.path.insert(0, os.path.normpath(os.path.join(dirname, '..')))
+
+from pptxpy import Template
+
+
+def main(uri, count=1000):
+  template = Template(uri)
+  prs = template()
+  model = range(len(template))
+  while len(prs.slides) < count:
+    prs.slides.instantiate_many(model[:count - len(prs.slides)])
+
+  cases = [
+    ('regular', {}),
+    ('stream', { 'stream': True }),
+  ] + [('workers=%d' % n, { 'workers': n }) for n in (2, 4, 8)]
+  for name, kwargs in cases:
+    start = time.perf_counter()
+    prs.save(io.BytesIO(), **kwargs)
+    elapsed = (time.perf_counter() - start) * 1000
+    print('%-10s %8.1f ms (%d slides)' % (name, elapsed, len(prs.slides)))
+
+
+if __name__ == '__main__':
+  default = os.path.join(dirname, '../tests/test_files/test_slides.pptx')
+  uri = sys.argv[1] if len(sys.argv) > 1 else default
+  main(uri, *map(int, sys.argv[2:3]))
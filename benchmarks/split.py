@@ -0,0 +1,54 @@
+# encoding: utf-8
+
+"""
+Time taken to split a deck of as many copies of the slides of a given one into
+*groups* decks of contiguous slides - through |split|, sequentially and with a
+pool of *workers*, versus loading the deck once per group and removing all other
+slides (see |Slides.remove_many|) before saving.
+
+Usage: python benchmarks/split.py [path.pptx] [slides] [groups]
+"""
+
+import io, os, sys, tempfile, time
+
+dirname = os.path.dirname(__file__)
+sys.path.insert(0, os.path.normpath(os.path.join(dirname, '..')))
+
+from pptx import Presentation
+import pptxpy
+
+
+def main(uri, count=500, groups=10):
+  prs = Presentation(uri)
+  sources = list(prs.slides)
+  while len(prs.slides) < count:
+    prs.slides.import_many(sources[:count - len(prs.slides)])
+  prs.collect_garbage()
+
+  blob = io.BytesIO()
+  prs.save(blob)
+
+  size = -(-count // groups)
+  chunks = [range(i, min(i + size, count)) for i in range(0, count, size)]
+  with tempfile.TemporaryDirectory() as tmp:
+    outs = [os.path.join(tmp, 'split%d.pptx' % i) for i in range(len(chunks))]
+
+    start = time.perf_counter()
+    for chunk, out in zip(chunks, outs):
+      blob.seek(0)
+      deck = Presentation(blob)
+      deck.slides.remove_many([i for i in range(count) if i not in chunk])
+      deck.save(out)
+    print('%-10s %8.2f s' % ('reload', time.perf_counter() - start))
+
+    for workers in (None, 2, 4):
+      start = time.perf_counter()
+      blob.seek(0)
+      pptxpy.split(Presentation(blob), chunks, outs, workers=workers)
+      print('%-10s %8.2f s' % ('workers=%s' % workers, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+  default = os.path.join(dirname, '../tests/test_files/test_slides.pptx')
+  uri = sys.argv[1] if len(sys.argv) > 1 else default
+  main(uri, *map(int, sys.argv[2:4]))
@@ -0,0 +1,47 @@
+# encoding: utf-8
+
+"""
+Per-instance cost of |Template| - reloading the source package on every call
+versus unmarshalling new presentations from the parsed, in-memory skeleton.
+
+Usage: python benchmarks/template.py [path.pptx] [repeat]
+"""
+
+import os, sys, timeit
+
+dirname = os.path.dirname(__file__)
+sys.path.insert(0, os.path.normpath(os.path.join(dirname, '..')))
+
+from pptx import Presentation
+from pptxpy import Template
+from pptxpy.common import RT
+
+
+def reload(uri):
+  prs = Presentation(uri)
+  prs.slides
+  for node in prs.slide_layouts:
+    node.part.drop_all(RT.SLIDE, recursive=False)
+
+  prs.part.drop_all(RT.SLIDE, { RT.COMMENT_AUTHORS, RT.PRES_PROPS })
+  prs.slides.clear()
+  return prs
+
+
+def main(uri, repeat=50):
+  template = Template(uri)
+  template()
+
+  cases = [
+    ('reload', lambda: reload(uri)),
+    ('skeleton', template),
+  ]
+  for name, case in cases:
+    elapsed = min(timeit.repeat(case, number=repeat, repeat=3)) / repeat
+    print('%-10s %8.2f ms/instance' % (name, elapsed * 1000))
+
+
+if __name__ == '__main__':
+  default = os.path.join(dirname, '../tests/test_files/test_slides.pptx')
+  uri = sys.argv[1] if len(sys.argv) > 1 else default
+  main(uri, *map(int, sys.argv[2:3]))
@@ -14,5 +14,7 @@ from .removal import _mount
 _mount()
 
 from .template import Template
+from .merging import merge
+from .splitting import split
 
 del _mount
@@ -1,10 +1,24 @@
 # encoding: utf-8
 
-from .common import Part, Rels, Rel, PartElementProxy, Slides, CT, RT, PackURI, NamespacePrefixedTag
-from .common import qn, _void, parse_xml, name_re, dump_xml, Cache
+import re, weakref
+from collections import OrderedDict
+from copy import deepcopy
+
+from .common import Part, Rels, Rel, PartElementProxy, Slides, CT, RT, PackURI
+from .common import NamespacePrefixedTag, qn, _void, _media, parse_xml, name_re
+from .common import dump_xml, Cache, XmlPart, OpcPackage, Digests
 
 idLstItem_tag = NamespacePrefixedTag('p:sldLayoutId').clark_name
 
+# XML declaration, comments and whitespace, then the root start tag up to the
+# value of its (unqualified) *name* attribute
+theme_name_re = re.compile(
+  br"""(?:\s|<\?.*?\?>|<!--.*?-->)*<[^\s/>!?]+"""
+  br"""(?:\s+[^\s=/>]+\s*=\s*(?:"[^"]*"|'[^']*'))*?"""
+  br"""\s+name\s*=\s*(["'])(.*?)\1""",
+  re.S
+)
+
 Rels._static = {
   RT.SLIDE, RT.IMAGE, RT.MEDIA, RT.VIDEO, RT.NOTES_MASTER#, RT.SLIDE_MASTER
 }
@@ -41,110 +55,315 @@ def Slides_duplicate(self, slide_index=None, slide_id=None, slide_master=False):
   slide_part = slide.part.clone(part._next_slide_partname, cloner)
 
   rId = part.relate_to(slide_part, RT.SLIDE)
-  self._sldIdLst.add_sldId(rId)
+  self._sldIdLst._add_sldId(id=part.package.ids.next_slide_id(), rId=rId)
 
   return slide_part.slide
 
 
+def Slides_import_slide(self, slide):
+  """
+  Imports the |Slide| instance *slide* - possibly of another presentation - by
+  cloning its |SlidePart| instance into the package of *self*, then appends it to
+  *self* (see |Slides.import_many|).
+
+  Return value: the newly created |Slide| instance.
+  """
+  return self.import_many([slide])[0]
+
+
+def Slides_import_many(self, slides):
+  """
+  Imports all *slides* - possibly of other presentations - through a single
+  |Cloner|, appending them to *self* in order. Parts of other packages are always
+  cloned, save for the slide layouts and masters structurally identical (see
+  |Digests|) to ones already within the package of *self*, which are reused
+  instead - thus importing any number of decks based on the same template brings
+  along a single copy of each distinct slide master. Slide jump links follow the
+  clones of their target slides, or get dropped if these aren't among *slides*.
+
+  Return value: the list of newly created |Slide| instances.
+  """
+  part = self.part
+  ids = part.package.ids
+  cloner = Cloner(part)
+
+  imported = []
+  for slide in slides:
+    slide_part = slide.part.clone(part._next_slide_partname, cloner)
+    rId = part.relate_to(slide_part, RT.SLIDE)
+    self._sldIdLst._add_sldId(id=ids.next_slide_id(), rId=rId)
+    imported.append(slide_part.slide)
+
+  cloner._link_jumps()
+  return imported
+
+
 def Part_clone(self, uri=None, cloner=None):
   """
   Creates an exact copy of this |Part| instance. The *partname* of the new instance
   is *uri* if non-null, otherwise *self.partname*.
 
-  Return value: The newly created |Part| instance.
+  Return value: The newly created |Part| instance (or the existing clone of *self*
+  within *cloner*).
   """
   if cloner is None:
     return self._clone(uri)
 
   if self not in cloner:
-    part = self._clone(uri)
+    part = self._clone(uri, cloner.package)
     cloner[part] = self
     return part
 
-  return self
+  return cloner._cache[self]
 
 
-def Part__clone(self, uri=None):
+def Part__clone(self, uri=None, package=None):
   """
   Creates a _shallow_ duplicate of *self*, optionally having *partname* assigned
-  the value of *uri* (if non-null), otherwise *self.partname*.
+  the value of *uri* (if non-null), otherwise *self.partname* - within *package*
+  (if non-null), otherwise *self.package*.
 
   Return value: The newly created |Part| instance.
   """
   if uri is None:
     uri = self.partname
 
+  if package is None:
+    package = self.package
+
+  element = self.__dict__.get('_element') if isinstance(self, XmlPart) else None
+  if element is not None and self.content_type == CT.OFC_THEME:
+    element = deepcopy(element)
+    _rename_theme(element)
+    part = type(self)(uri, self.content_type, element, package)
+    return package.index.add(part)
+
   blob = self.blob
   if self.content_type == CT.OFC_THEME:
-    xml = parse_xml(self.blob)
-    name = xml.attrib['name']
-    xml.attrib['name'] = name_re.sub(lambda m: "%d_" % (int(m.group(1) or '0') + 1), name)
-    blob = dump_xml(xml)
+    blob = _rename_theme_blob(blob)
+
+  part = self.load_lazy(uri, self.content_type, blob, package)
+  return package.index.add(part)
+
+
+def _rename(name):
+  return name_re.sub(lambda m: "%d_" % (int(m.group(1) or '0') + 1), name)
+
+def _rename_theme(element):
+  name = element.get('name')
+  if name is not None:
+    element.set('name', _rename(name))
+
+def _rename_theme_blob(blob):
+  """
+  Renames the theme serialized by *blob* by editing the *name* attribute of its
+  root start tag alone, falling back to a full parse for unforeseen markup (e.g.
+  encodings other than UTF-8).
+
+  Return value: The edited blob.
+  """
+  m = theme_name_re.match(blob)
+  if m is None:
+    element = parse_xml(blob)
+    _rename_theme(element)
+    return dump_xml(element)
+
+  start, end = m.span(2)
+  name = _rename(m.group(2).decode('utf-8'))
+  return blob[:start] + name.encode('utf-8') + blob[end:]
+
+
+class CloneCache:
+  """
+  Package-wide cache mapping the slide masters and layouts cloned so far to their
+  clones - reused by all subsequent cloning processes - along with the rIds of the
+  relationships |Cloner| added to the presentation part, mapped from their targets.
+  Slide masters and layouts of the package are also mapped from their digests -
+  those of the parts of other packages they were imported from, or their own (see
+  |Cloner._match|).
+
+  Parts are only held weakly, and entries get invalidated as their parts are
+  dropped from the package (see |OpcPackage.discard|); beyond *maxsize* entries
+  (None for no bound), the least recently used clones are evicted as well - thus
+  cloned anew, if needed again.
+  """
+  def __init__(self, maxsize=1024):
+    self.hits = 0
+    self.misses = 0
+    self.related = weakref.WeakKeyDictionary()
+    self.by_digest = None
+    self._clones = OrderedDict()
+    self.maxsize = maxsize
+
+  def __len__(self):
+    return len(self._clones)
+
+  def __contains__(self, part):
+    return self._lookup(part) is not None
+
+  def __getitem__(self, part):
+    clone = self._lookup(part)
+    if clone is None:
+      raise KeyError(part)
+    return clone
+
+  def __setitem__(self, part, clone):
+    key = weakref.ref(part, self._expire)
+    self._clones.pop(key, None)
+    self._clones[key] = weakref.ref(clone)
+    self._evict()
+
+  def get(self, part):
+    """
+    Looks up the clone of *part*, recording a hit or a miss if *part* is of a
+    cached content type.
+
+    Return value: The clone of *part*, or None.
+    """
+    if part.content_type not in Part._cached:
+      return
+
+    clone = self._lookup(part)
+    if clone is None:
+      self.misses += 1
+      return
+
+    self.hits += 1
+    self._clones.move_to_end(weakref.ref(part))
+    return clone
+
+  @property
+  def maxsize(self):
+    return self._maxsize
+
+  @maxsize.setter
+  def maxsize(self, maxsize):
+    self._maxsize = maxsize
+    self._evict()
+
+  @property
+  def hit_rate(self):
+    lookups = self.hits + self.misses
+    return self.hits / lookups if lookups else 0.0
+
+  def invalidate(self, parts):
+    """
+    Discards all entries involving any of *parts* - as either source or clone.
+    """
+    for key, ref in list(self._clones.items()):
+      if key() in parts or ref() in parts:
+        del self._clones[key]
+
+    for part in parts:
+      self.related.pop(part, None)
 
-  return self.load(uri, self.content_type, blob, self.package)
+    if self.by_digest is not None:
+      for digest, part in list(self.by_digest.items()):
+        if part in parts:
+          del self.by_digest[digest]
+
+  def clear(self):
+    self._clones.clear()
+    self.related.clear()
+    self.by_digest = None
+
+  def _lookup(self, part):
+    ref = self._clones.get(weakref.ref(part))
+    return ref() if ref is not None else None
+
+  def _expire(self, key):
+    self._clones.pop(key, None)
+
+  def _evict(self):
+    if self._maxsize is not None:
+      while len(self._clones) > self._maxsize:
+        self._clones.popitem(last=False)
 
 
 class Cloner(Cache):
   """
   Utility class for handling the cloning process for a given |_Relationship|
-  instance; uses a *_cache* to store all cloned |Part| instances - thus
-  avoiding _infinite recursion_.
+  instance; traverses the relationship graph through an explicit worklist (rather
+  than recursively), using a *_cache* to map every cloned |Part| instance to its
+  clone - thus visiting each of them exactly once. Slide masters and layouts are
+  also recorded by the |CloneCache| of the package.
+
+  The parts being cloned may belong to other packages than that of *prs*, in
+  which case they are cloned regardless of the *slide_master* flag and of their
+  relationships being static - save for media, notes masters and the parts
+  matched by |_match|, for which the ones within the package get reused, and for
+  slides, which are never cloned as targets (see |_link_jumps|).
   """
   def __init__(self, prs, slide_master=False):
     super().__init__(prs.package)
-    self._cache = set()
+    self._cache = {}
+    self._work = []
     # self._slide_masters = set(slide_masters) if slide_masters is not None else None
     self._slide_master = slide_master
 
-    if not hasattr(prs, '_cache'):
-      prs._cache = {}
-    self._gcache = prs._cache
-
-    if not hasattr(prs, '_related'):
-      prs._related = {}
-    self._rels = prs._related
-
-    _prs = prs.presentation
-    if not hasattr(prs, '_max_sldId'):
-      max_sldId = 0
-      if len(_prs.slide_masters) > 0:
-        master = _prs.slide_masters[-1]
-        layout_ids = master.slide_layouts._sldLayoutIdLst
-        if len(layout_ids) > 0:
-          max_sldId = int(layout_ids[-1].attrib['id'])
-      prs._max_sldId = max_sldId
-
+    self._gcache = self.package.clone_cache
+    self._rels = self._gcache.related
+    self._ids = self.package.ids
     self._prs = prs
+    self._digests = Digests()
+    self._jumps = []
 
   def __setitem__(self, dest, src):
     if src is None:
       return
 
+    # only the outermost call drains the worklist, nested ones just extend it
+    drain = not self._work
+    self._visit(dest, src)
+    if drain:
+      self._drain()
+
+  def _visit(self, dest, src, link=None):
+    """
+    Registers *dest* as the clone of *src*, then schedules the relationships of
+    *src* to be cloned onto *dest*; *link* holds the arguments to |_link| for the
+    relationship leading to *src*, pending until all of them have been cloned.
+    """
     part = None
     if isinstance(src, Part):
       if src.content_type in Part._cached:
         self._gcache[src] = dest
-      else:
-        self._cache.add(src)
+        if src.package is not self.package:
+          self._by_digest.setdefault(self._digests[src], dest)
+      self._cache[src] = dest
       part = src
 
     rels = self._get_rels(src)
     if isinstance(rels, dict):
       rels = rels.values()
 
-    if rels is None:
-      return
-
-    dest = self._get_rels(dest)
-    ct = part.content_type if part else None
     try:
+      rels = iter(rels)
+    except TypeError:
+      rels = iter(_void)
+
+    self._work.append((self._get_rels(dest), part, rels, link))
+
+  def _drain(self):
+    """
+    Processes the worklist depth-first - in the very order a recursive traversal
+    would, as the cloned parts get their relationships attached (and related to the
+    presentation) only after their targets' own relationships.
+    """
+    work = self._work
+    while work:
+      dest, src, rels, link = work[-1]
+      ct = src.content_type if src else None
       for rel in rels:
         if rel.reltype in Part._closed.get(ct, _void):
           continue
-        dest.attach(self._clone(rel, part))
+        if self._clone(dest, rel, src):
+          break
 
-    except TypeError:
-      pass
+      else:
+        work.pop()
+        if link is not None:
+          self._link(*link)
 
   @classmethod
   def _get_rels(cls, self):
@@ -161,41 +380,164 @@ class Cloner(Cache):
   def __contains__(self, part):
     return part in self._cache
 
-  def _clone(self, rel, src):
+  def _clone(self, dest, rel, src):
+    """
+    Clones *rel* (of *src*) onto *dest* - unless its target part is to be cloned
+    first, in which case that gets scheduled through |_visit|.
+
+    Return value: whether *rel* is pending on the worklist.
+    """
     ct = src.content_type if src else None
     if rel.is_external:
       target = rel.target_ref
     else:
       target = rel.target_part
+      if rel.reltype in _media:
+        target = self._add_media(target)
+
+      foreign = target.package is not self.package
+      if rel.reltype == RT.SLIDE and foreign and target not in self._cache:
+        # slide jumps wait for their targets to be imported along, if at all
+        self._jumps.append((dest, rel, src, target))
+        return False
+
       if self._cloneable(rel, ct):
-        if target in self._gcache:
-          target = self._gcache[target]
-        elif not rel.is_static and (target.content_type != CT.PML_SLIDE_MASTER or self._slide_master):
+        clone = self._gcache.get(target)
+        if clone is None and foreign:
+          clone = self._match(target)
+
+        if clone is not None:
+          target = clone
+        elif target in self._cache:
+          target = self._cache[target]
+        elif foreign and target.content_type == CT.PML_NOTES_MASTER:
+          target = self._prs.notes_master_part
+        elif foreign or not rel.is_static and (
+          target.content_type != CT.PML_SLIDE_MASTER or self._slide_master
+        ):
           uri = self.next_partname(target.partname.template)
-          target = target.clone(uri, self)
-          if target.content_type == CT.PML_SLIDE_MASTER:
-            for item in target.slide_master.slide_layouts._sldLayoutIdLst.iterchildren():
-              item.delete()
+          part = target._clone(uri, self.package)
+          self._visit(part, target, (dest, rel, src, part, True))
+          return True
 
-        if target.content_type == CT.PML_SLIDE_MASTER and ct == CT.PML_SLIDE_LAYOUT and src in self._gcache:
-          rId = target.relate_to(self._gcache[src], RT.SLIDE_LAYOUT)
-          r = target.rels[rId]
-          id_list = target.slide_master.slide_layouts._sldLayoutIdLst
-          self._prs._max_sldId += 1
-          item = id_list.makeelement(idLstItem_tag, { 'id': str(self._prs._max_sldId), qn('r:id'): r.rId }, id_list.nsmap)
-          id_list.append(item)
+    self._link(dest, rel, src, target)
+    return False
 
-        if target not in self._rels:
-          self._rels[target] = self._prs.relate_to(target, rel.reltype)
+  def _link(self, dest, rel, src, target, cloned=False):
+    ct = src.content_type if src else None
+    if not rel.is_external and self._cloneable(rel, ct):
+      if cloned and target.content_type == CT.PML_SLIDE_MASTER:
+        for item in target.slide_master.slide_layouts._sldLayoutIdLst.iterchildren():
+          item.delete()
+
+      is_master = target.content_type == CT.PML_SLIDE_MASTER
+      if is_master and ct == CT.PML_SLIDE_LAYOUT and src in self._cache:
+        rId = target.relate_to(self._cache[src], RT.SLIDE_LAYOUT)
+        r = target.rels[rId]
+        id_list = target.slide_master.slide_layouts._sldLayoutIdLst
+        attrs = { 'id': str(self._ids.next_master_id()), qn('r:id'): r.rId }
+        item = id_list.makeelement(idLstItem_tag, attrs, id_list.nsmap)
+        id_list.append(item)
+
+      # only the relationships added here are recorded - as weak ones (see
+      # |Presentation.collect_garbage|)
+      rels = self._prs.rels
+      if target not in self._rels and rels._get_matching(rel.reltype, target) is None:
+        self._rels[target] = self._prs.relate_to(target, rel.reltype)
+        if cloned and target.content_type == CT.PML_SLIDE_MASTER:
+          id_list = self._prs._element.get_or_add_sldMasterIdLst()
+          item = id_list._new_sldMasterId()
+          item.set('id', str(self._ids.next_master_id()))
+          item.rId = self._rels[target]
+          id_list._insert_sldMasterId(item)
+
+    dest.attach(Rel(rel.rId, rel.reltype, target, rel._baseURI, rel.is_external))
+
+  def _link_jumps(self):
+    """
+    Links the slide jumps to slides of other packages deferred by |_clone| to the
+    clones of their targets, if imported along; otherwise these are dropped, along
+    with the elements referencing them (e.g. *a:hlinkClick*) - as the target slides
+    are never cloned on their own.
+    """
+    jumps, self._jumps = self._jumps, []
+    for dest, rel, src, target in jumps:
+      if target in self._cache:
+        self._link(dest, rel, src, self._cache[target])
+        continue
+
+      # *dest* is the relationship collection of the cloned part
+      for item in dest._source._element.xpath('.//*[@r:id="%s"]' % rel.rId):
+        item.getparent().remove(item)
+
+  def _add_media(self, part):
+    """
+    Return value: The media part of the package holding the same blob as *part* -
+    a clone of *part*, if it belongs to another package and no such part exists.
+    """
+    media = self.package.media
+    if part.package is self.package:
+      return media.add(part)
+
+    clone = media.get(part.sha256)
+    if clone is None:
+      uri = self.next_partname(part.partname.template)
+      clone = media.add(part._clone(uri, self.package))
+    return clone
+
+  def _match(self, part):
+    """
+    Looks up the slide master or layout of the package structurally identical to
+    *part* (of another package) by its digest.
+
+    Return value: The matching |Part| instance, or None.
+    """
+    if part.content_type not in Part._cached:
+      return
+
+    return self._by_digest.get(self._digests[part])
+
+  @property
+  def _by_digest(self):
+    """
+    The digest index of the |CloneCache| of the package, built upon first access
+    from the slide masters (and their layouts) related to the presentation part.
+    """
+    if self._gcache.by_digest is None:
+      by_digest = self._gcache.by_digest = weakref.WeakValueDictionary()
+      digests = Digests()
+      for rel in self._prs.rels.values():
+        if rel.reltype != RT.SLIDE_MASTER or rel.is_external:
+          continue
+        master = rel.target_part
+        by_digest.setdefault(digests[master], master)
+        for r in master.rels.values():
+          if r.reltype == RT.SLIDE_LAYOUT and not r.is_external:
+            by_digest.setdefault(digests[r.target_part], r.target_part)
 
-    return Rel(rel.rId, rel.reltype, target, rel._baseURI, rel.is_external)
+    return self._gcache.by_digest
 
   @classmethod
   def _cloneable(cls, rel, content_type):
     return content_type in Rels._restricted.get(rel.reltype, { content_type })
 
 
+@property
+def OpcPackage_clone_cache(self):
+  """
+  The |CloneCache| of *self*, created upon first access - with the default
+  *maxsize*, which may be set through the cache itself.
+  """
+  if getattr(self, '_clone_cache', None) is None:
+    self._clone_cache = CloneCache()
+
+  return self._clone_cache
+
+
 def _mount():
   Slides.duplicate = Slides_duplicate
+  Slides.import_slide = Slides_import_slide
+  Slides.import_many = Slides_import_many
   Part.clone = Part_clone
   Part._clone = Part__clone
+  OpcPackage.clone_cache = OpcPackage_clone_cache
@@ -5,23 +5,27 @@ try:
 except ImportError:
   raise Exception("Module pptx-py requires python-pptx in order to run. Install it first, then try again.")
 
-import posixpath, re
-from collections import defaultdict
+import hashlib, heapq, posixpath, re
+from collections import Counter, defaultdict
 
 from pptx.opc.constants import RELATIONSHIP_TYPE as RT, CONTENT_TYPE as CT
 from pptx.opc.oxml import serialize_part_xml as dump_xml
-from pptx.opc.package import _Relationship as Rel, RelationshipCollection as Rels, Part, OpcPackage
-from pptx.opc.packuri import PackURI
+from pptx.opc.package import _Relationship as Rel, RelationshipCollection as Rels
+from pptx.opc.package import Part, XmlPart, OpcPackage
+from pptx.opc.packuri import PackURI, PACKAGE_URI
 from pptx.oxml import parse_xml
 from pptx.shared import PartElementProxy
 from pptx.slide import Slide, Slides
 from pptx.oxml.ns import NamespacePrefixedTag, qn
+from pptx.oxml.presentation import CT_SlideIdList
 from pptx.presentation import Presentation
 from pptx.parts.presentation import PresentationPart
 from pptx.parts.slide import SlidePart
 from pptx.util import lazyproperty
 
 _void = set()
+_rename_slide_parts = PresentationPart.rename_slide_parts
+_insert_sldId = CT_SlideIdList._insert_sldId
 
 tmpl_re = re.compile(r"^(.+?)(\d+)?(\.\w+)?$")
 name_re = re.compile(r"^(?:(\d+)_)?")
@@ -38,22 +42,10 @@ _static = {
 class Cache:
   def __init__(self, package):
     self._package = package
-    self._partnames = defaultdict(lambda: 0)
-    self._usednames = { p.partname for p in self.package.iter_parts() }
     self._parts = {}
 
   def next_partname(self, tmpl):
-    self._partnames[tmpl] += 1
-    while not self._available(tmpl):
-      self._partnames[tmpl] += 1
-
-    return self._uri(tmpl)
-
-  def _available(self, tmpl):
-    return self._uri(tmpl) not in self._usednames
-
-  def _uri(self, tmpl):
-    return PackURI(tmpl % self._partnames[tmpl])
+    return self.package.partnames.next_partname(tmpl)
 
   @property
   def package(self):
@@ -68,6 +60,417 @@ class Cache:
     self._parts[model] = part
 
 
+class Partnames:
+  """
+  Package-wide partname allocator; keeps the set of partnames in use along with
+  a high-water mark for each template, below which every partname is taken -
+  thus handing out the lowest available partname in amortized constant time.
+  """
+  def __init__(self, package):
+    self._usednames = { p.partname for p in package.iter_parts() }
+    self._marks = defaultdict(lambda: 0)
+
+  def next_partname(self, tmpl):
+    index = self._marks[tmpl] + 1
+    while self._uri(tmpl, index) in self._usednames:
+      index += 1
+
+    self._marks[tmpl] = index
+    return self.add(self._uri(tmpl, index))
+
+  def add(self, partname):
+    self._usednames.add(partname)
+    return partname
+
+  def discard(self, partname):
+    """
+    Releases *partname*, lowering the high-water mark of its template accordingly.
+    """
+    self._usednames.discard(partname)
+    tmpl = partname.template
+    if 0 < partname.index <= self._marks.get(tmpl, 0):
+      self._marks[tmpl] = partname.index - 1
+
+  def __contains__(self, partname):
+    return partname in self._usednames
+
+  @classmethod
+  def _uri(cls, tmpl, index):
+    return PackURI(tmpl % index)
+
+
+class Ids:
+  """
+  Package-wide allocator of the ids of slides (*sldId*), as well as of slide
+  masters and layouts (*sldMasterId* and *sldLayoutId*, sharing a single range);
+  each range is scanned once, upon first use - then ids above all of those in use
+  are handed out in constant time (see |_IdRange|). Slide ids inserted into
+  *sldIdLst* by any other means (e.g. python-pptx's |CT_SlideIdList.add_sldId|)
+  are recorded upon insertion.
+  """
+  def __init__(self, package):
+    self._package = package
+    self._slides = None
+    self._masters = None
+
+  def next_slide_id(self):
+    if self._slides is None:
+      prs = self._package.main_document_part._element
+      # being kept alive, this very proxy of *sldIdLst* is the one all insertions
+      # go through (see |CT_SlideIdList._insert_sldId|)
+      sldIdLst = self._sldIdLst = prs.get_or_add_sldIdLst()
+      sldIdLst._ids = self
+      scan = lambda: sldIdLst.xpath('./p:sldId/@id')
+      self._slides = _IdRange(256, 2147483647, scan)
+
+    return self._slides.next()
+
+  def add_slide_id(self, id):
+    """
+    Records *id* as being in use by a slide.
+    """
+    if self._slides is not None:
+      self._slides.add(id)
+
+  def next_master_id(self):
+    """
+    Return value: The next id for either a slide master or a slide layout.
+    """
+    if self._masters is None:
+      self._masters = _IdRange(2147483648, 4294967295, self._master_ids)
+
+    return self._masters.next()
+
+  def _master_ids(self):
+    prs = self._package.main_document_part
+    ids = prs._element.xpath('./p:sldMasterIdLst/p:sldMasterId/@id')
+    for rel in prs.rels.values():
+      if rel.reltype == RT.SLIDE_MASTER and not rel.is_external:
+        layouts = rel.target_part._element
+        ids.extend(layouts.xpath('./p:sldLayoutIdLst/p:sldLayoutId/@id'))
+
+    return ids
+
+
+class _IdRange:
+  """
+  The ids from *first* to *last*, as handed out by |Ids|: above all of those in
+  use - as listed by *scan*, or handed out or recorded since - then, once *last*
+  is reached, the lowest ones not in use (just as python-pptx does).
+  """
+  def __init__(self, first, last, scan):
+    self._first = first
+    self._last = last
+    self._scan = scan
+    self._used = { int(id) for id in scan() }
+    self._high = max(self._used, default=first - 1)
+    self._gap = None
+
+  def add(self, id):
+    self._used.add(id)
+    self._high = max(self._high, id)
+
+  def next(self):
+    if self._high < self._last:
+      id = self._high = max(self._high + 1, self._first)
+    else:
+      id = self._next_gap()
+
+    self._used.add(id)
+    return id
+
+  def _next_gap(self):
+    """
+    Return value: The lowest id not in use, above the previous one - scanning the
+    ids in use anew once there is none, as some may have been released since.
+    """
+    for _ in range(2):
+      id = self._first if self._gap is None else self._gap
+      while id <= self._last and id in self._used:
+        id += 1
+
+      if id <= self._last:
+        self._gap = id + 1
+        return id
+
+      self._used = { int(id) for id in self._scan() }
+      self._gap = None
+
+    raise ValueError("all ids from %d to %d are in use" % (self._first, self._last))
+
+
+class Index(dict):
+  """
+  Lookup table mapping ``(partname, content_type)`` pairs to the |Part| instances
+  of a given package; populated once (via a full traversal) and then kept up to
+  date as parts are loaded, cloned, renamed or dropped (see |OpcPackage.discard|).
+  """
+  def __init__(self, package):
+    super().__init__()
+    for part in package.iter_parts():
+      self.add(part)
+
+  def add(self, part):
+    self[part.partname, part.content_type] = part
+    return part
+
+  def discard(self, part):
+    key = (part.partname, part.content_type)
+    if self.get(key) is part:
+      del self[key]
+
+
+class Media(dict):
+  """
+  Content-addressed store mapping the SHA-256 digests of media blobs (images,
+  audio, video) to the |Part| instances holding them within a given package.
+  """
+  def __init__(self, package):
+    super().__init__()
+    for rel in package.iter_rels():
+      if rel.reltype in _media and not rel.is_external:
+        self.add(rel.target_part)
+
+  def add(self, part):
+    """
+    Return value: The |Part| registered for the digest of *part* - which is *part*
+    itself, unless an identical blob is already present.
+    """
+    return self.setdefault(part.sha256, part)
+
+  def discard(self, part):
+    digest = getattr(part, '_sha256', None)
+    if digest is not None and self.get(digest) is part:
+      del self[digest]
+
+
+class Inbound(dict):
+  """
+  Reverse relationship index mapping each |Part| of a given package to the set of
+  ``(source, rId)`` pairs of the internal relationships targeting it; kept up to
+  date by the relationship collections of *package* and its parts.
+  """
+  def __init__(self, package):
+    super().__init__()
+    self.update_from(package)
+    for part in package.iter_parts():
+      self.update_from(part)
+
+  def update_from(self, source):
+    for rel in source.rels.values():
+      self.add(source, rel)
+
+  def add(self, source, rel):
+    if not rel.is_external:
+      self.setdefault(rel.target_part, set()).add((source, rel.rId))
+
+  def discard(self, source, rel):
+    if rel.is_external:
+      return
+
+    target = rel.target_part
+    refs = self.get(target)
+    if refs is not None:
+      refs.discard((source, rel.rId))
+      if not refs:
+        del self[target]
+
+  def sources(self, part):
+    """
+    Return value: The ``(source, rId)`` pairs of the relationships targeting *part*.
+    """
+    return set(self.get(part, _void))
+
+
+class Digests(dict):
+  """
+  Maps parts to Merkle-style structural digests - hashing their content type and
+  blob along with the rId, reltype and target digest (or target ref) of each of
+  their relationships - computed upon first lookup. Static and closed relationships
+  (e.g. notes slide -> slide, slide master -> slide layouts) only contribute the
+  shallow digest of their target, while any other cycle contributes the distance
+  to its target along the current path - thus alike graphs get alike digests.
+
+  Being mutable, parts don't cache their own digests; these remain valid for as
+  long as the parts of a given |Digests| instance are left unchanged.
+  """
+  def __init__(self):
+    super().__init__()
+    self._shallow = {}
+
+  def __missing__(self, part):
+    path = { part: 0 }
+    stack = [self._frame(part)]
+    while True:
+      source, h, rels = stack[-1]
+      closed = Part._closed.get(source.content_type, _void)
+      for rel in rels:
+        h.update(('\0%s\0%s\0' % (rel.rId, rel.reltype)).encode())
+        if rel.is_external:
+          h.update(rel.target_ref.encode())
+          continue
+
+        target = rel.target_part
+        if rel.is_static or rel.reltype in closed:
+          h.update(self.shallow(target))
+        elif target in self:
+          h.update(self[target].encode())
+        elif target in path:
+          h.update(b'^%d' % (len(stack) - path[target]))
+        else:
+          path[target] = len(stack)
+          stack.append(self._frame(target))
+          break
+
+      else:
+        stack.pop()
+        del path[source]
+        digest = self[source] = h.hexdigest()
+        if not stack:
+          return digest
+        stack[-1][1].update(digest.encode())
+
+  def shallow(self, part):
+    """
+    Return value: The digest of the content type and blob of *part* alone.
+    """
+    digest = self._shallow.get(part)
+    if digest is None:
+      h = hashlib.sha256(part.content_type.encode() + b'\0')
+      h.update(part.blob if isinstance(part, XmlPart) else part.sha256.encode())
+      digest = self._shallow[part] = h.digest()
+
+    return digest
+
+  def _frame(self, part):
+    rels = sorted(part.rels.values(), key=lambda rel: rel.rId)
+    return part, hashlib.sha256(self.shallow(part)), iter(rels)
+
+
+class Comparison:
+  """
+  Structural comparison of parts and relationship collections for the duration of
+  a single top-level call: identical operands are equal outright, and each pair of
+  operands is compared at most once - pairs still under comparison are assumed
+  equal, hence cycles terminate. Relationships are followed *depth* levels deep
+  (as per |Digests| if None), where 0 compares target parts shallowly.
+  """
+  def __init__(self, depth=None, digests=None):
+    self.depth = depth
+    self.digests = Digests() if digests is None else digests
+    self._pairs = {}
+
+  @classmethod
+  def of(cls, rels, comparison=None):
+    """
+    Return value: *comparison* if non-null, otherwise a new |Comparison| following
+    relationships as far as *rels* says - either a Boolean or a depth.
+    """
+    if comparison is not None:
+      return comparison
+
+    return cls(None if rels is True else int(rels))
+
+  def parts(self, part, other, depth=None):
+    if part is other:
+      return True
+
+    return self._memo(self._parts, part, other, depth)
+
+  def rels(self, rels, other, depth=None):
+    if rels is other:
+      return True
+
+    return self._memo(self._rels, rels, other, depth)
+
+  def _memo(self, compare, a, b, depth):
+    key = (id(a), id(b), depth)
+    result = self._pairs.get(key)
+    if result is None:
+      self._pairs[key] = True
+      result = self._pairs[key] = compare(a, b, depth)
+
+    return result
+
+  def _parts(self, part, other, depth):
+    if part is None or other is None:
+      return False
+
+    if not isinstance(other, Part):
+      return False
+
+    if not part.partname.is_similar(other.partname):
+      return False
+
+    if part.content_type != other.content_type:
+      return False
+
+    digests = self.digests
+    if digests.shallow(part) != digests.shallow(other):
+      return False
+
+    if depth is None:
+      return digests[part] == digests[other]
+
+    return depth == 0 or self.rels(part.rels, other.rels, depth - 1)
+
+  def _rels(self, rels, other, depth):
+    if rels is None or other is None:
+      return False
+
+    if not isinstance(other, dict):
+      return False
+
+    if len(rels) != len(other):
+      return False
+
+    for rId, rel in rels.items():
+      if not rId in other:
+        return False
+      if not self.rel(rel, other[rId], depth):
+        return False
+
+    return True
+
+  def rel(self, rel, other, depth=None):
+    if not isinstance(other, Rel):
+      return False
+
+    if rel.reltype != other.reltype:
+      return False
+
+    if rel.is_external != other.is_external:
+      return False
+
+    if rel.is_external:
+      return rel.target_ref == other.target_ref
+
+    return self.parts(rel.target_part, other.target_part, depth)
+
+
+class _Element:
+  """
+  Data descriptor standing in for |XmlPart._element|; parts created via *load_lazy*
+  share the serialized *blob* of their source and only parse it into an element
+  tree upon first access.
+  """
+  def __get__(self, part, owner=None):
+    if part is None:
+      return self
+
+    element = part.__dict__.get('_element')
+    if element is None and part._blob is not None:
+      element = part.__dict__['_element'] = parse_xml(part._blob)
+      part._blob = None
+
+    return element
+
+  def __set__(self, part, element):
+    # the serialized blob no longer stands for the element tree of *part*
+    part.__dict__['_element'] = element
+    part._blob = None
+
+
 def Slides_at(self, slide_index=None, slide_id=None):
   """
   """
@@ -84,12 +487,125 @@ def Slides_at(self, slide_index=None, slide_id=None):
 
   return slide
 
+def Slides_add_slide(self, slide_layout):
+  """
+  Same as the original |Slides.add_slide|, except for the id of the new slide
+  being handed out by the |Ids| allocator of the package.
+  """
+  rId, slide = self.part.add_slide(slide_layout)
+  slide.shapes.clone_layout_placeholders(slide_layout)
+  self._sldIdLst._add_sldId(id=self.part.package.ids.next_slide_id(), rId=rId)
+  return slide
+
+def CT_SlideIdList__insert_sldId(self, sldId):
+  """
+  Same as the original |CT_SlideIdList._insert_sldId| - through which all other
+  insertions go - except for the id of *sldId* being recorded by the |Ids|
+  allocator of the package, if any.
+  """
+  sldId = _insert_sldId(self, sldId)
+  ids = getattr(self, '_ids', None)
+  if ids is not None:
+    ids.add_slide_id(sldId.id)
+
+  return sldId
+
 def Slides_clear(self):
   """
   Removes all slides from *self*.
   """
   return self._sldIdLst.clear()
 
+def Slides_reorder(self, order=None, key=None, slide_ids=None):
+  """
+  Rearranges the slides of *self* according to exactly one of *order* - a
+  permutation of all slides, given by their indices - *slide_ids*, the same given
+  by slide ids, or *key*, a function mapping each |Slide| to a sort key;
+  *sldIdLst* is rewritten in a single pass.
+
+  Return value: *self*.
+  """
+  if [order, key, slide_ids].count(None) != 2:
+    raise ValueError("exactly one of order, key and slide_ids is required")
+
+  sldIdLst = self._sldIdLst
+  items = list(sldIdLst)
+  if key is not None:
+    keys = [key(slide) for slide in self]
+    positions = sorted(range(len(items)), key=keys.__getitem__)
+  else:
+    ids = { item.id: i for i, item in enumerate(items) }
+    if order is not None:
+      positions = [_position(ids, slide_index) for slide_index in order]
+    else:
+      positions = [_position(ids, slide_id=slide_id) for slide_id in slide_ids]
+    if len(positions) != len(items) or len(set(positions)) != len(items):
+      raise ValueError("order must be a permutation of all %d slides" % len(items))
+
+  sldIdLst[:] = [items[i] for i in positions]
+  return self
+
+def Slides_move_many(self, moves=None, slide_ids=None):
+  """
+  Moves the slides given by *moves* - a dict or a sequence of ``(index, position)``
+  pairs - and by *slide_ids* - the same, keyed by slide ids - so that each of them
+  ends up at *position* within the resulting sequence; all other slides keep their
+  relative order. *sldIdLst* is rewritten in a single pass.
+
+  Return value: *self*.
+  """
+  sldIdLst = self._sldIdLst
+  items = list(sldIdLst)
+  count = len(items)
+  ids = { item.id: i for i, item in enumerate(items) }
+  keyed = [
+    (key, _position(ids, key), position) for key, position in _pairs(moves)
+  ] + [
+    (key, _position(ids, slide_id=key), position) for key, position in _pairs(slide_ids)
+  ]
+
+  slots, moved = [None] * count, set()
+  for key, i, position in keyed:
+    if position < 0:
+      position += count
+    if not 0 <= position < count or slots[position] is not None or i in moved:
+      raise ValueError(
+        "conflicting or invalid move of slide %r to %r" % (key, position)
+      )
+
+    slots[position] = items[i]
+    moved.add(i)
+
+  rest = (item for i, item in enumerate(items) if i not in moved)
+  sldIdLst[:] = [item if item is not None else next(rest) for item in slots]
+  return self
+
+def _pairs(moves):
+  if moves is None:
+    return ()
+
+  return moves.items() if isinstance(moves, dict) else moves
+
+def _position(ids, slide_index=None, slide_id=None):
+  """
+  Return value: The position of the slide given by either *slide_index* or
+  *slide_id*, within the slides whose *ids* are mapped to their positions.
+  """
+  if slide_id is not None:
+    position = ids.get(int(slide_id))
+    if position is None:
+      raise ValueError("no slide with id %s" % slide_id)
+    return position
+
+  count = len(ids)
+  if not isinstance(slide_index, int):
+    raise ValueError("slide index %r is not an int" % (slide_index,))
+
+  position = slide_index + count if slide_index < 0 else slide_index
+  if not 0 <= position < count:
+    raise ValueError("slide index %d out of range" % slide_index)
+  return position
+
 def Slide_is_similar(self, other):
   if self is None:
     return other is None
@@ -115,32 +631,125 @@ def Rels_attach(self, rel):
   return target
 
 
-def Rels_eq(self, other, rels=True):
+def Rels_setitem(self, rId, rel):
+  inbound = self._inbound
+  if inbound is not None:
+    if rId in self:
+      inbound.discard(self._source, self[rId])
+    inbound.add(self._source, rel)
+
+  matching = getattr(self, '_matching', None)
+  if matching is not None:
+    if rId in self:
+      _unmatch(matching, self[rId])
+    matching.setdefault(_match_key(rel), {})[rId] = rel
+
+  dict.__setitem__(self, rId, rel)
+
+def Rels_delitem(self, rId):
+  inbound = self._inbound
+  if inbound is not None:
+    inbound.discard(self._source, self[rId])
+
+  matching = getattr(self, '_matching', None)
+  if matching is not None:
+    _unmatch(matching, self[rId])
+
+  # rIds freed below the high-water mark are the only gaps |_next_rId| may reuse
+  n = _rId_number(rId)
+  if n is not None and n < getattr(self, '_high', 1):
+    heapq.heappush(self._free, n)
+
+  dict.__delitem__(self, rId)
+  self._target_parts_by_rId.pop(rId, None)
+
+def Rels__get_matching(self, reltype, target, is_external=False):
   """
-  Performs structural equality testing between *self* and *other*.
+  Looks up the relationship of *reltype* to *target* (a part, or a reference if
+  *is_external*) through an index of *self* by (reltype, target) - built upon
+  first lookup, then kept up to date by |Rels.__setitem__| and |Rels.__delitem__|
+  (thus by |Rels.attach|, |Part.load_rel| and |Part.drop_rel| alike).
 
-  Return value: The Boolean result of the tests.
+  Return value: The first such |_Relationship| in *self*, or None.
   """
-  if self is None:
-    return other is None
+  if getattr(self, '_matching', None) is None:
+    self._matching = {}
+    for rId, rel in self.items():
+      self._matching.setdefault(_match_key(rel), {})[rId] = rel
 
-  if other is None:
-    return False
+  rels = self._matching.get((reltype, target, is_external))
+  if not rels:
+    return None
 
-  if not isinstance(other, dict):
-    return False
+  if len(rels) > 1:
+    # duplicates are rare, and only *self* keeps them in their actual order
+    return next(rel for rel in self.values() if rel.rId in rels)
+  return next(iter(rels.values()))
 
-  if len(self) != len(other):
-    return False
+@property
+def Rels__next_rId(self):
+  """
+  The lowest rId available in *self* - just as python-pptx would allocate it, yet
+  in amortized constant time: all rIds below a high-water mark are either taken
+  or kept in a heap of freed ones (see |Rels.__delitem__|), some of which may
+  have been taken again since.
+  """
+  if getattr(self, '_free', None) is None:
+    self._free = []
+
+  free = self._free
+  while free and 'rId%d' % free[0] in self:
+    heapq.heappop(free)
+  if free:
+    return 'rId%d' % free[0]
+
+  high = getattr(self, '_high', 1)
+  while 'rId%d' % high in self:
+    high += 1
+  self._high = high
+  return 'rId%d' % high
+
+def _match_key(rel):
+  if rel.is_external:
+    return rel.reltype, rel.target_ref, True
+  return rel.reltype, rel.target_part, False
 
-  for rId, rel in self.items():
-    if not rId in other:
-      return False
-    #if rel != other[rId]:
-    if not rel.equals(other[rId], rels):
-      return False
+def _unmatch(matching, rel):
+  key = _match_key(rel)
+  rels = matching.get(key)
+  if rels is not None:
+    rels.pop(rel.rId, None)
+    if not rels:
+      del matching[key]
+
+def _rId_number(rId):
+  if rId.startswith('rId') and rId[3:].isdigit():
+    return int(rId[3:])
+
+@property
+def Rels_inbound(self):
+  """
+  The |Inbound| index of the package *self* belongs to - if there is one.
+  """
+  source = getattr(self, '_source', None)
+  if not isinstance(source, OpcPackage):
+    source = getattr(source, 'package', None)
+  return getattr(source, '_inbound', None)
+
+
+def Rels_eq(self, other, rels=True, comparison=None):
+  """
+  Performs structural equality testing between *self* and *other*, following
+  relationships as far as *rels* says - either a Boolean or a depth (see
+  |Comparison|).
+
+  Return value: The Boolean result of the tests.
+  """
+  if self is None:
+    return other is None
 
-  return True
+  comparison = Comparison.of(rels, comparison)
+  return comparison.rels(self, other, comparison.depth)
 
 
 def Rels_pprint(self):
@@ -152,26 +761,12 @@ def Rel_is_static(self):
   return self.reltype in Rels._static
 
 
-def Rel_eq(self, other, rels=True):
+def Rel_eq(self, other, rels=True, comparison=None):
   if self is None:
     return other is None
 
-  if other is None:
-    return False
-
-  if not isinstance(other, Rel):
-    return False
-
-  if self.reltype != other.reltype:
-    return False
-
-  if not self.target_part.is_similar(other.target_part, rels):
-    return False
-
-  if self.is_external != other.is_external:
-    return False
-
-  return True
+  comparison = Comparison.of(rels, comparison)
+  return comparison.rel(self, other, comparison.depth)
 
 
 def Rel_pprint(self):
@@ -212,91 +807,347 @@ def PackURI_is_similar(self, other):
 
 def OpcPackage_getitem(self, cursor):
   part, reltype = cursor
-  uri = part.partname
-  ct = part.content_type
   if reltype not in _static:
     return
-  for part in self.iter_parts():
-    if part.partname == uri and part.content_type == ct:
-      return part
+
+  if reltype in _media:
+    return self.media.get(part.sha256)
+
+  return self.index.get((part.partname, part.content_type))
+
+@property
+def OpcPackage_index(self):
+  """
+  The |Index| of all parts within *self*, built upon first access.
+  """
+  if getattr(self, '_index', None) is None:
+    self._index = Index(self)
+
+  return self._index
+
+@property
+def OpcPackage_partnames(self):
+  """
+  The |Partnames| allocator shared by all cloning and instantiation processes
+  targeting *self*, built upon first access.
+  """
+  if getattr(self, '_partnames', None) is None:
+    self._partnames = Partnames(self)
+
+  return self._partnames
+
+def OpcPackage_next_partname(self, tmpl):
+  """
+  Return a |PackURI| instance representing the next available partname matching
+  *tmpl* (e.g. '/ppt/slides/slide%d.xml'), reserving it within *self.partnames*.
+  """
+  return self.partnames.next_partname(tmpl)
+
+@property
+def OpcPackage_ids(self):
+  """
+  The |Ids| allocator of *self*, created upon first access.
+  """
+  if getattr(self, '_ids', None) is None:
+    self._ids = Ids(self)
+
+  return self._ids
+
+@property
+def OpcPackage_inbound(self):
+  """
+  The |Inbound| relationship index of *self*, built upon first access.
+  """
+  if getattr(self, '_inbound', None) is None:
+    self._inbound = Inbound(self)
+
+  return self._inbound
+
+@property
+def OpcPackage_rels(self):
+  if getattr(self, '_rels', None) is None:
+    self._rels = Rels(PACKAGE_URI.baseURI)
+    self._rels._source = self
+
+  return self._rels
+
+@property
+def OpcPackage_media(self):
+  """
+  The |Media| store of *self*, built upon first access.
+  """
+  if getattr(self, '_media', None) is None:
+    self._media = Media(self)
+
+  return self._media
+
+def OpcPackage_discard(self, parts):
+  """
+  Discards *parts* - no longer within *self* - from the |Index|, |Partnames|,
+  |Media| and |Inbound| index of *self* (those built so far), as well as from its
+  |CloneCache|; all of these are updated in place, none rebuilt.
+  """
+  if not parts:
+    return
+
+  index = getattr(self, '_index', None)
+  partnames = getattr(self, '_partnames', None)
+  media = getattr(self, '_media', None)
+  inbound = getattr(self, '_inbound', None)
+  for part in parts:
+    if index is not None:
+      index.discard(part)
+    if partnames is not None:
+      partnames.discard(part.partname)
+    if media is not None:
+      media.discard(part)
+    if inbound is not None:
+      for rel in part.rels.values():
+        inbound.discard(part, rel)
+
+  cache = getattr(self, '_clone_cache', None)
+  if cache is not None:
+    cache.invalidate(parts)
+
+def _orphans(package, rels):
+  """
+  Performs a trial deletion over the parts reachable from the internal targets of
+  *rels*: those still targeted by relationships from outside of this subgraph (as
+  per the |Inbound| index of *package*) survive, along with the parts reachable
+  from them - relationships within the subgraph alone (e.g. notes slide -> slide)
+  don't keep any part alive.
+
+  Return value: The set of parts no longer reachable within *package*.
+  """
+  inbound = package.inbound
+  targets = [rel.target_part for rel in rels if not rel.is_external]
+  candidates = set(_walk(list(dict.fromkeys(targets))))
+  alive = [
+    part for part in candidates
+    if any(source not in candidates for source, rId in inbound.get(part, _void))
+  ]
+
+  return candidates.difference(_walk(alive, lambda source, part: part in candidates))
+
+def _walk(sources, follow=None):
+  """
+  Traverses the relationship graph depth-first from *sources* (a package, or a
+  list of parts), following the internal relationships *follow* accepts - given
+  their source and target parts - if given; much like |OpcPackage.iter_parts|, yet
+  iteratively and through a set of visited parts.
+
+  Return value: The list of visited parts, in order.
+  """
+  if isinstance(sources, list):
+    visited, parts = set(sources), list(sources)
+    stack = [(part, iter(part.rels.values())) for part in reversed(sources)]
+  else:
+    visited, parts = set(), []
+    stack = [(sources, iter(sources.rels.values()))]
+
+  while stack:
+    source, rels = stack[-1]
+    for rel in rels:
+      if rel.is_external:
+        continue
+
+      part = rel.target_part
+      if part in visited or follow is not None and not follow(source, part):
+        continue
+
+      visited.add(part)
+      parts.append(part)
+      stack.append((part, iter(part.rels.values())))
+      break
+
+    else:
+      stack.pop()
+
+  return parts
+
+
+@property
+def PresentationPart_next_slide_partname(self):
+  return self.package.next_partname('/ppt/slides/slide%d.xml')
+
+def PresentationPart_rename_slide_parts(self, rIds):
+  """
+  Same as the original |PresentationPart.rename_slide_parts|, except for the
+  renamed slide parts being re-keyed within the |Index| and |Partnames| of the
+  package (if built).
+  """
+  package = self.package
+  index = getattr(package, '_index', None)
+  partnames = getattr(package, '_partnames', None)
+  parts = [self.related_parts[rId] for rId in rIds]
+  for part in parts:
+    if index is not None:
+      index.discard(part)
+    if partnames is not None:
+      partnames.discard(part.partname)
+
+  _rename_slide_parts(self, rIds)
+  for part in parts:
+    if index is not None:
+      index.add(part)
+    if partnames is not None:
+      partnames.add(part.partname)
 
 def Part_drop(self, part, exclude=None):
   dropped = set()
-  for rel in self.rels.values():
+  for source, rId in self.package.inbound.sources(part):
+    if source is not self:
+      continue
+
+    rel = self.rels[rId]
     if exclude is not None and rel.reltype in exclude:
       continue
 
-    if not rel.is_external and rel.target_part is part:
-      dropped.add(rel)
+    dropped.add(rel)
 
   for rel in dropped:
     self.drop_rel(rel.rId)
     # del self.rels[rId]
 
+  if dropped:
+    self.package.discard(_orphans(self.package, dropped))
+
   return dropped
 
 def Part_drop_all(self, reltype, recursive=True):
-  dropped = set()
+  """
+  Drops all relationships of *reltype* - along with, if *recursive*, those to the
+  parts related to their targets, save for relationships of the reltypes within
+  *recursive* (unless it is a Boolean) - through a single pass over *self.rels*
+  and a single count of the rIds referenced by the XML of *self*; as per
+  |Part.drop_rel|, the relationships referenced more than once are kept.
+
+  Return value: The set of dropped relationships.
+  """
+  dropped, targets = set(), defaultdict(set)
   for rel in self.rels.values():
     if rel.reltype == reltype:
       dropped.add(rel)
-
-  exclude = None if isinstance(recursive, bool) else recursive
+    if not rel.is_external:
+      targets[rel.target_part].add(rel)
+
+  if recursive:
+    exclude = _void if isinstance(recursive, bool) else recursive
+    for rel in list(dropped):
+      if rel.is_external:
+        continue
+      for part in rel.target_part.related_parts.values():
+        dropped.update(r for r in targets.get(part, _void) if r.reltype not in exclude)
+
+  refs = Counter(self._element.xpath('//@r:id'))
   for rel in dropped:
-    if recursive and not rel.is_external:
-      for part in rel.target_part.related_parts:
-        dropped.update(self.drop(part, exclude))
+    if refs[rel.rId] < 2:
+      del self.rels[rel.rId]
 
-    self.drop_rel(rel.rId)
-    # del self.rels[rId]
+  if dropped:
+    self.package.discard(_orphans(self.package, dropped))
 
   return dropped
 
-def Part_is_similar(self, other, rels=True):
+def Part_is_similar(self, other, rels=True, comparison=None):
   """
-  Essentially performs shallow structural equality testing between
-  *self* and *other* - with the exception of *partname* which is
-  tested for _similarity_ rather then _equality_.
+  Essentially performs structural equality testing between *self* and *other* -
+  with the exception of *partname* which is tested for _similarity_ rather then
+  _equality_ - following relationships as far as *rels* says: either a Boolean or
+  a depth (see |Comparison|).
 
   Return value: The Boolean result of the tests.
   """
   if self is None:
     return other is None
 
-  if other is None:
-    return False
+  comparison = Comparison.of(rels, comparison)
+  return comparison.parts(self, other, comparison.depth)
 
-  if not isinstance(other, Part):
-    return False
+@property
+def Part_basename(self):
+  return posixpath.basename(self.partname)
 
-  if self.partname.is_similar(other.partname):
-    return False
+@property
+def Part_rels(self):
+  if getattr(self, '_rels', None) is None:
+    self._rels = Rels(self._partname.baseURI)
+    self._rels._source = self
 
-  if self.content_type != other.content_type:
-    return False
+  return self._rels
 
-  if self.blob != other.blob:
-    return False
+@property
+def Part_digest(self):
+  """
+  Structural digest of *self* (see |Digests|), computed afresh upon each access.
+  """
+  return Digests()[self]
 
-  if self.package != other.package:
-    return False
+@property
+def Part_sha256(self):
+  """
+  Hex digest of *self.blob*, computed upon first access - and afresh once *blob*
+  gets assigned (see |Part.blob|).
+  """
+  if getattr(self, '_sha256', None) is None:
+    self._sha256 = hashlib.sha256(self.blob).hexdigest()
 
-  if rels and self.rels != other.rels:
-    return False
+  return self._sha256
+
+def Part_set_blob(self, blob):
+  """
+  Same as the original |Part.blob| setter, except for the cached *sha256* of
+  *self* being reset - and *self* re-keyed within the |Media| store of its package
+  (if built).
+  """
+  media = getattr(self.package, '_media', None)
+  stored = media is not None and media.get(getattr(self, '_sha256', None)) is self
+  if stored:
+    media.discard(self)
+
+  self._blob = blob
+  self._sha256 = None
+  if stored:
+    media.add(self)
+
+def Part_load_lazy(cls, partname, content_type, blob, package):
+  return cls.load(partname, content_type, blob, package)
 
-  return True
 
 @property
-def Part_basename(self):
-  return posixpath.basename(self.partname)
+def XmlPart_blob(self):
+  if self._blob is not None:
+    return self._blob
+
+  return dump_xml(self._element)
+
+def XmlPart_load_lazy(cls, partname, content_type, blob, package):
+  """
+  Creates a new instance sharing *blob*, which is parsed only once the element
+  tree of the part is first accessed.
+
+  Return value: The newly created |XmlPart| instance.
+  """
+  part = cls(partname, content_type, None, package)
+  part._blob = blob
+  return part
 
 
 def _mount():
   Slides.at = Slides_at
+  Slides.add_slide = Slides_add_slide
   Slides.clear = Slides_clear
+  Slides.reorder = Slides_reorder
+  Slides.move_many = Slides_move_many
   Slide.is_similar = Slide_is_similar
+  CT_SlideIdList._insert_sldId = CT_SlideIdList__insert_sldId
 
   Rels.attach = Rels_attach
+  Rels.__setitem__ = Rels_setitem
+  Rels.__delitem__ = Rels_delitem
+  Rels._get_matching = Rels__get_matching
+  Rels._next_rId = Rels__next_rId
+  Rels._inbound = Rels_inbound
   Rels.__eq__ = Rels_eq
   Rels.equals = Rels_eq
   Rels.pprint = Rels_pprint
@@ -311,6 +1162,17 @@ def _mount():
   PackURI.is_similar = PackURI_is_similar
 
   OpcPackage.__getitem__ = OpcPackage_getitem
+  OpcPackage.index = OpcPackage_index
+  OpcPackage.partnames = OpcPackage_partnames
+  OpcPackage.next_partname = OpcPackage_next_partname
+  OpcPackage.media = OpcPackage_media
+  OpcPackage.ids = OpcPackage_ids
+  OpcPackage.inbound = OpcPackage_inbound
+  OpcPackage.rels = OpcPackage_rels
+  OpcPackage.discard = OpcPackage_discard
+
+  PresentationPart._next_slide_partname = PresentationPart_next_slide_partname
+  PresentationPart.rename_slide_parts = PresentationPart_rename_slide_parts
 
   SlidePart._reltypes = {
     RT.NOTES_SLIDE, #RT.SLIDE_LAYOUT
@@ -321,5 +1183,14 @@ def _mount():
   Part.drop_all = Part_drop_all
   Part.is_similar = Part_is_similar
   Part.basename = Part_basename
+  Part.digest = Part_digest
+  Part.sha256 = Part_sha256
+  Part.blob = Part.blob.setter(Part_set_blob)
+  Part.rels = Part_rels
+  Part.load_lazy = classmethod(Part_load_lazy)
+
+  XmlPart._element = _Element()
+  XmlPart.blob = XmlPart_blob
+  XmlPart.load_lazy = classmethod(XmlPart_load_lazy)
   Part._reltypes = {}
   Part._reltype = None
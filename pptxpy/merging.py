@@ -0,0 +1,133 @@
+# encoding: utf-8
+
+import gc
+from pptx import Presentation as _load
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from pptx.opc.pkgwriter import _ContentTypesItem
+
+from .common import Part, Rel, CT, dump_xml, _walk
+from .saving import ZipStream
+
+# parts shared across sources - thus kept loaded until all of them are imported
+_shared = {
+  CT.PML_SLIDE_MASTER, CT.PML_SLIDE_LAYOUT, CT.PML_NOTES_MASTER
+}
+
+
+def merge(paths, out, compression=None, workers=None):
+  """
+  Merges the decks found at *paths* into *out* (a path or a file-like object), in
+  order; the first deck provides the presentation all others get imported into
+  (see |Slides.import_many|).
+
+  Sources are opened one at a time and released once imported, while their slides
+  - along with all the parts only these relate to - are written to *out* right
+  away (see |ZipStream|) and then replaced by bodiless placeholders; only slide
+  masters, layouts and notes masters stay loaded until the end. Thus peak memory
+  follows the largest source rather than the sum of all of them.
+
+  Return value: The number of merged slides.
+  """
+  paths = iter(paths)
+  first = next(paths, None)
+  if first is None:
+    raise ValueError("no decks to merge")
+
+  prs = _load(first)
+  package = prs.part.package
+  stream = ZipStream(out, compression)
+  flushed = set()
+  try:
+    _flush(stream, prs.part, [slide.part for slide in prs.slides], flushed)
+    for path in paths:
+      src = _load(path)
+      slides = prs.slides.import_many(list(src.slides))
+      _flush(stream, prs.part, [slide.part for slide in slides], flushed)
+      del src, slides
+      gc.collect()
+
+    parts = _walk(package)
+    pending = [part for part in parts if part not in flushed]
+    for part in pending:
+      part.before_marshal()
+
+    stream.write(CONTENT_TYPES_URI, dump_xml(_ContentTypesItem.xml_for(parts)))
+    stream.write(PACKAGE_URI.rels_uri, package.rels.xml)
+    stream.write_parts(pending, workers)
+  finally:
+    stream.close()
+
+  return len(prs.slides)
+
+
+def _flush(stream, prs, slides, flushed):
+  """
+  Writes the parts reachable from *slides* - short of the |_shared| ones and of
+  those already *flushed* - to *stream*, then swaps each of them for a placeholder
+  throughout the relationship graph; the placeholders are related to each other
+  just like the parts they stand in for, thus remaining reachable (e.g. by
+  |Partnames| and |Media|).
+  """
+  package = prs.package
+
+  def pending(source, part):
+    return part.content_type not in _shared and part not in flushed
+
+  parts = _walk(slides, pending)
+  for part in parts:
+    part.before_marshal()
+  stream.write_parts(parts)
+
+  _unrelate(prs, parts)
+  inbound = package.inbound
+  for part in parts:
+    for rel in part.rels.values():
+      inbound.discard(part, rel)
+
+  # the digests of all media are known once |Media| is built
+  media = package.media
+  placeholders = { part: _placeholder(part) for part in parts }
+  for part, placeholder in placeholders.items():
+    for source, rId in inbound.sources(part):
+      rel = source.rels[rId]
+      source.rels.attach(Rel(rId, rel.reltype, placeholder, rel._baseURI))
+
+    for rel in part.rels.values():
+      if rel.is_external:
+        target = rel.target_ref
+      else:
+        target = placeholders.get(rel.target_part, rel.target_part)
+      rel = Rel(rel.rId, rel.reltype, target, rel._baseURI, rel.is_external)
+      placeholder.rels.attach(rel)
+
+    package.index.add(placeholder)
+    if media.get(placeholder._sha256) is part:
+      media[placeholder._sha256] = placeholder
+    flushed.add(placeholder)
+
+
+def _unrelate(prs, parts):
+  """
+  Drops the relationships |Cloner| added to *prs* for any of *parts* - save for
+  those its XML references (e.g. slides, within *sldIdLst*).
+  """
+  related = prs.package.clone_cache.related
+  refs = set(prs._element.xpath('//@r:id'))
+  for part in parts:
+    rId = related.get(part)
+    if rId is None or rId in refs or rId not in prs.rels:
+      continue
+
+    rel = prs.rels[rId]
+    if not rel.is_external and rel.target_part is part:
+      del prs.rels[rId]
+
+
+def _placeholder(part):
+  """
+  Return value: A bodiless |Part| instance standing in for *part* (already
+  written) - sharing its partname, content type and SHA-256 digest, if known.
+  """
+  placeholder = Part(part.partname, part.content_type, b'', part.package)
+  placeholder._sha256 = getattr(part, '_sha256', None)
+  return placeholder
@@ -1,31 +1,188 @@
 # encoding: utf-8
 
-from .common import Slides
+from collections import Counter, defaultdict
+from lxml import etree
+from .common import Slides, Presentation, XmlPart, CT, RT, _void, _orphans
+
+_r_refs = etree.XPath(
+  "//@*[namespace-uri()="
+  "'http://schemas.openxmlformats.org/officeDocument/2006/relationships']"
+)
+
+_explicit = {
+  RT.SLIDE, RT.SLIDE_LAYOUT, RT.SLIDE_MASTER, RT.IMAGE, RT.MEDIA, RT.VIDEO,
+  RT.CHART, RT.PACKAGE, RT.OLE_OBJECT
+}
+
+_implicit = {
+  (CT.PML_SLIDE, RT.SLIDE_LAYOUT), (CT.PML_SLIDE_LAYOUT, RT.SLIDE_MASTER),
+  (CT.PML_NOTES_SLIDE, RT.SLIDE)
+}
 
 
 def Slides_remove(self, slide_index=None, slide_id=None, sweep=True):
   """
+  Removes the |Slide| instance given by either *slide_index* _or_ *slide_id* from
+  *self*; if *sweep* is set, the relationships of all other slides targeting it
+  are dropped as well - as found through the |Inbound| index of the package.
+
+  Return value: The removed |Slide| instance.
   """
   slide = self.at(slide_index, slide_id)
   if slide is None:
     return
 
-  prs = self.parent
+  return self._remove([slide], sweep)[0]
+
+def Slides_remove_many(self, indices=None, slide_ids=None, sweep=True):
+  """
+  Removes all |Slide| instances given by *indices* and *slide_ids* from *self* in
+  a single pass - resolving them up front, then editing *sldIdLst* once and
+  visiting each relationship source (the presentation part, as well as the
+  slides being swept if *sweep* is set) only once.
+
+  Return value: The list of removed |Slide| instances.
+  """
+  slides, parts = [], set()
+  victims = [self.at(slide_index) for slide_index in indices or ()]
+  victims += [self.at(slide_id=slide_id) for slide_id in slide_ids or ()]
+  for slide in victims:
+    if slide is not None and slide.part not in parts:
+      parts.add(slide.part)
+      slides.append(slide)
+
+  return self._remove(slides, sweep)
+
+def Slides__remove(self, slides, sweep=True):
+  part = self.part
+  inbound = part.package.inbound
+  parts = { slide.part for slide in slides }
+
+  dropped = defaultdict(set)
+  for slide in slides:
+    for source, rId in inbound.sources(slide.part):
+      if source is part:
+        dropped[source].add(rId)
+      elif sweep and source.content_type == CT.PML_SLIDE and source not in parts:
+        dropped[source].add(rId)
+
+  rIds = dropped.get(part, _void)
+  sldIdLst = self._sldIdLst
+  sldIdLst[:] = [item for item in sldIdLst if item.rId not in rIds]
+
+  rels = []
+  for source, rIds in dropped.items():
+    refs = Counter(_r_refs(source._element))
+    for rId in rIds:
+      if refs[rId] < (1 if source is part else 2):
+        rels.append(source.rels[rId])
+        del source.rels[rId]
+
+  if dropped:
+    part.package.discard(_orphans(part.package, rels))
+
+  return slides
+
+def Presentation_collect_garbage(self):
+  """
+  Performs a single reachability traversal from the package root, where _weak_
+  relationships - those recorded by |Cloner| on the presentation part, as well
+  as those of explicit types, whose rId isn't referenced by the XML of their
+  source - don't count. Weak relationships targeting unreachable parts are
+  dropped, and the |CloneCache| and package indices are purged accordingly.
+
+  Return value: The number of bytes reclaimed (i.e. the total size of the parts
+  which are no longer saved).
+  """
+  part = self.part
+  package = part.package
+  cache = getattr(package, '_clone_cache', None)
+  related = cache.related.items() if cache is not None else ()
+  # entries whose relationship has been dropped meanwhile (e.g. by drop_all) are stale
+  weak_rIds = { rId for target, rId in related if _target(part, rId) is target }
+
+  # slide masters added by |Cloner| don't count as referenced by sldMasterIdLst
+  id_list = part._element.sldMasterIdLst
+  master_ids = {}
+  if id_list is not None:
+    master_ids = { item.rId: item for item in id_list if item.rId in weak_rIds }
+
+  reachable, weak = set(), []
+  stack = [package]
+  while stack:
+    source = stack.pop()
+    refs = None
+    for rel in source.rels.values():
+      if rel.is_external:
+        continue
+
+      if source is part and rel.rId in weak_rIds or _is_explicit(source, rel):
+        if refs is None:
+          refs = _references(source)
+          if source is part:
+            refs -= master_ids.keys()
+        if rel.rId not in refs:
+          weak.append((source, rel))
+          continue
+
+      target = rel.target_part
+      if target not in reachable:
+        reachable.add(target)
+        stack.append(target)
+
+  garbage = set()
+  stack = [rel.target_part for source, rel in weak if rel.target_part not in reachable]
+  while stack:
+    target = stack.pop()
+    if target in reachable or target in garbage:
+      continue
+
+    garbage.add(target)
+    stack.extend(rel.target_part for rel in target.rels.values() if not rel.is_external)
+
+  for source, rel in weak:
+    if rel.target_part not in reachable:
+      del source.rels[rel.rId]
+      if source is part and rel.rId in master_ids:
+        item = master_ids[rel.rId]
+        item.getparent().remove(item)
+
+  package.discard(garbage)
+  return sum(len(target.blob) for target in garbage)
 
-  dropped = prs.part.drop(slide.part)
-  sldIds = set()
-  for item in self._sldIdLst:
-    if item.rId in dropped:
-      sldIds.add(item)
+def Presentation_save(self, file, collect_garbage=False):
+  """
+  Saves *self* to *file*, optionally performing |collect_garbage| beforehand.
+  """
+  if collect_garbage:
+    self.collect_garbage()
+
+  self.part.save(file)
+
+
+def _target(part, rId):
+  rel = part.rels.get(rId)
+  return rel.target_part if rel is not None and not rel.is_external else None
 
-  for item in sldIds:
-    item.delete()
+def _is_explicit(source, rel):
+  if not isinstance(source, XmlPart):
+    return False
 
-  if sweep:
-    for s in self:
-      s.part.drop(slide.part)
+  if rel.reltype not in _explicit:
+    return False
+
+  return (source.content_type, rel.reltype) not in _implicit
+
+def _references(source):
+  """
+  Return value: The set of rIds referenced by the XML of *source*.
+  """
+  return set(_r_refs(source._element))
 
-  return slide
 
 def _mount():
   Slides.remove = Slides_remove
+  Slides.remove_many = Slides_remove_many
+  Slides._remove = Slides__remove
+  Presentation.collect_garbage = Presentation_collect_garbage
+  Presentation.save = Presentation_save
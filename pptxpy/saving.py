@@ -0,0 +1,138 @@
+# encoding: utf-8
+
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
+
+from lxml import etree
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from pptx.opc.pkgwriter import _ContentTypesItem
+
+from .common import XmlPart, dump_xml
+
+_compression = {
+  'image': 0, 'audio': 0, 'video': 0
+}
+
+
+class ZipStream:
+  """
+  Writes a package to a zip archive one part at a time; XML parts are serialized
+  straight into their compressed archive members, while blobs are written in
+  chunks of at most *chunk_size* bytes - thus no more than a single part is ever
+  held in serialized form.
+
+  *compression* maps content types (e.g. 'image/png') or their media types (e.g.
+  'image') to zlib compression levels, where 0 stores the member uncompressed;
+  media is stored by default and everything else deflated (at the default level).
+  Members given any other level are written through |ZipFile.writestr| - the only
+  public API taking a level - thus their XML parts are serialized beforehand.
+  """
+  def __init__(self, file, compression=None, chunk_size=1 << 20):
+    self._zipf = ZipFile(file, 'w', compression=ZIP_DEFLATED)
+    self._compression = dict(_compression)
+    if compression is not None:
+      self._compression.update(compression)
+    self._chunk_size = chunk_size
+
+  def write(self, uri, data, content_type=None):
+    """
+    Writes *data* - either a blob or an XML element - as the member given by *uri*.
+    """
+    level = self._level(content_type)
+    zinfo = self._zinfo(uri, level)
+    if level:
+      if not isinstance(data, bytes):
+        data = dump_xml(data)
+      self._zipf.writestr(zinfo, data, compresslevel=level)
+      return
+
+    if isinstance(data, bytes):
+      zinfo.file_size = len(data)
+
+    with self._zipf.open(zinfo, 'w') as f:
+      if isinstance(data, bytes):
+        view = memoryview(data)
+        for i in range(0, len(view), self._chunk_size):
+          f.write(view[i:i + self._chunk_size])
+      else:
+        etree.ElementTree(data).write(f, encoding='UTF-8', standalone=True)
+
+  def write_part(self, part):
+    """
+    Writes *part*, along with its relationships (if any).
+    """
+    if isinstance(part, XmlPart) and part._blob is None:
+      data = part._element
+    else:
+      data = part.blob
+
+    self.write(part.partname, data, part.content_type)
+    if len(part.rels):
+      self.write(part.partname.rels_uri, part.rels.xml)
+
+  def write_parts(self, parts, workers=None):
+    """
+    Writes all *parts* in order; given a number of *workers*, blobs are serialized
+    within a thread pool (lxml releases the GIL), at most *2 * workers* parts
+    ahead of the sequential archive writes - which deflate them meanwhile, zlib
+    releasing the GIL as well.
+    """
+    if not workers:
+      for part in parts:
+        self.write_part(part)
+      return
+
+    with ThreadPoolExecutor(workers) as pool:
+      pending = deque()
+      for part in parts:
+        pending.append((part, pool.submit(_serialize, part)))
+        if len(pending) > 2 * workers:
+          self._write_serialized(*pending.popleft())
+
+      while pending:
+        self._write_serialized(*pending.popleft())
+
+  def close(self):
+    self._zipf.close()
+
+  def _write_serialized(self, part, future):
+    self.write(part.partname, future.result(), part.content_type)
+    if len(part.rels):
+      self.write(part.partname.rels_uri, part.rels.xml)
+
+  def _zinfo(self, uri, level=None):
+    zinfo = ZipInfo(uri.membername, time.localtime(time.time())[:6])
+    zinfo.external_attr = 0o600 << 16
+    zinfo.compress_type = ZIP_STORED if level == 0 else ZIP_DEFLATED
+    return zinfo
+
+  def _level(self, content_type):
+    if content_type is None:
+      return
+
+    if content_type in self._compression:
+      return self._compression[content_type]
+
+    return self._compression.get(content_type.partition('/')[0])
+
+
+def _serialize(part):
+  return part.blob
+
+
+def save(package, file, compression=None, chunk_size=1 << 20, workers=None):
+  """
+  Saves *package* to *file* (a path or a file-like object) through a |ZipStream|,
+  one part at a time - or *workers* parts at a time (see |ZipStream.write_parts|).
+  """
+  parts = package.parts
+  for part in parts:
+    part.before_marshal()
+
+  stream = ZipStream(file, compression, chunk_size)
+  stream.write(CONTENT_TYPES_URI, dump_xml(_ContentTypesItem.xml_for(parts)))
+  stream.write(PACKAGE_URI.rels_uri, package.rels.xml)
+  stream.write_parts(parts, workers)
+  stream.close()
@@ -1,9 +1,33 @@
 # encoding: utf-8
 
+from lxml import etree
 from .common import Slide, RT
 
 pp_hlinksldjump = "ppaction://hlinksldjump"
-_hlinksldjump = "//*[@action='%s']" % pp_hlinksldjump
+_hlinksldjump = etree.XPath("//*[@action='%s']" % pp_hlinksldjump)
+
+
+def link_paths(element):
+  """
+  Return value: The paths (as tuples of child indices, starting from *element*)
+  of all slide jump links within *element*.
+  """
+  return [_path(element, link) for link in _hlinksldjump(element)]
+
+def _path(root, node):
+  path = []
+  while node is not root:
+    parent = node.getparent()
+    path.append(parent.index(node))
+    node = parent
+
+  return tuple(reversed(path))
+
+def _follow(root, path):
+  for index in path:
+    root = root[index]
+
+  return root
 
 
 def relate(self, rId=None):
@@ -16,12 +40,15 @@ def relate(self, rId=None):
   return rId
 
 class _Slide(Slide):
-  def __init__(self, part, sldId):
+  def __init__(self, part, sldId, links=None):
     Slide.__init__(self, part._element, part)
     part._slide = self
     self._links = {}
     self._sldId = sldId
-    self._hlinksldjumps = self.slide_jumps
+    if links is None:
+      self._hlinksldjumps = self.slide_jumps
+    else:
+      self._hlinksldjumps = [_follow(part._element, path) for path in links]
     for link in self._hlinksldjumps:
       relate(link)
 
@@ -88,7 +115,7 @@ class _Slide(Slide):
 
   @property
   def slide_jumps(self):
-    return self._xpath(_hlinksldjump)  
+    return _hlinksldjump(self.part._element)
 
   def relink(self, links_dict=None, **links):
     self._drain(links_dict)
@@ -132,11 +159,7 @@ class _Slide(Slide):
 
       return relate(link)
 
-    if rId in rels:
-      rels[rId]._target = target
-    else:
-      self.part.load_rel(RT.SLIDE, target, rId)
-
+    self.part.load_rel(RT.SLIDE, target, rId)
     return rId
 
   def _update(self, slides, update=False):
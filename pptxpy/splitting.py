@@ -0,0 +1,178 @@
+# encoding: utf-8
+
+import multiprocessing, os
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from pptx.opc.pkgwriter import _ContentTypesItem
+
+from .common import Rels, RT, qn, dump_xml, _position, _walk
+from .removal import _is_explicit, _references
+from .saving import ZipStream
+
+# slide ids listed by the sections of a presentation (PowerPoint 2010 and later)
+section_sldId_tag = '{http://schemas.microsoft.com/office/powerpoint/2010/main}sldId'
+
+# the presentation part being split by the processes of the pool, if any
+_source = None
+
+
+def split(prs, groups, outs, compression=None, workers=None):
+  """
+  Splits the presentation *prs* into as many packages as *groups* - sequences of
+  slides, each given by its index (if an |int|) or slide id (otherwise) - written
+  to the corresponding *outs* (paths or file-like objects). Each package holds the
+  transitive relationship closure of its own slides alone, along with the parts
+  the presentation part relates to (slide masters, themes, properties etc.) - save
+  for its weak relationships (see |_weak|); all of these are written straight from
+  *prs*, which is parsed once and left as is.
+
+  Given a number of *workers*, groups are written by a pool of processes forked
+  off the current one - thus sharing *prs* as parsed already - which requires
+  *outs* to be paths; where forking is unavailable, groups are written in turn.
+
+  Return value: The list of slide counts of the written packages.
+  """
+  outs = list(outs)
+  sldIdLst = prs.slides._sldIdLst
+  items = list(sldIdLst)
+  ids = { item.id: i for i, item in enumerate(items) }
+  groups = [{ items[_locate(ids, key)].rId for key in group } for group in groups]
+  if len(groups) != len(outs):
+    raise ValueError("got %d groups, yet %d outputs" % (len(groups), len(outs)))
+
+  part = prs.part
+  for p in _walk(part.package):
+    p.before_marshal()
+
+  weak = _weak(part)
+  if not workers or 'fork' not in multiprocessing.get_all_start_methods():
+    return [
+      _write(part, rIds, out, compression, weak) for rIds, out in zip(groups, outs)
+    ]
+
+  if not all(isinstance(out, (str, os.PathLike)) for out in outs):
+    raise ValueError("outputs must be paths in order to be written by worker processes")
+
+  global _source
+  _source = part
+  try:
+    context = multiprocessing.get_context('fork')
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+      count = len(outs)
+      return list(
+        pool.map(_write_forked, groups, outs, [compression] * count, [weak] * count)
+      )
+  finally:
+    _source = None
+
+
+def _locate(ids, key):
+  if isinstance(key, int):
+    return _position(ids, key)
+
+  return _position(ids, slide_id=key)
+
+
+def _write_forked(rIds, out, compression, weak):
+  return _write(_source, rIds, out, compression, weak)
+
+
+def _write(prs, rIds, out, compression=None, weak=frozenset()):
+  """
+  Writes the package holding the slides related to *prs* (a presentation part) by
+  *rIds*, in the order of *sldIdLst*, to *out*. Other slides are left out along
+  with all relationships to them - much like |Slides.remove| sweeps these - and
+  so are the *weak* relationships of *prs* (see |_weak|); the parts holding such
+  relationships are written as pruned copies (see |_pruned|), the presentation
+  part also short of the sections of other slides.
+
+  Return value: The number of written slides.
+  """
+  package = prs.package
+  kept = {
+    rId: rel for rId, rel in prs.rels.items()
+    if rId not in weak and (rel.reltype != RT.SLIDE or rId in rIds)
+  }
+  targets = { rel.target_part for rel in kept.values() if not rel.is_external }
+  slides = { rel.target_part for rel in prs.rels.values() if rel.reltype == RT.SLIDE }
+  skipped = slides - targets
+
+  def keep(part, rId, rel):
+    if part is prs:
+      return rId in kept
+    return rel.is_external or rel.target_part not in skipped
+
+  element = _pruned(prs, keep)
+  slide_ids = set(element.xpath('./p:sldIdLst/p:sldId/@id'))
+  for item in list(element.iter(section_sldId_tag)):
+    if item.get('id') not in slide_ids:
+      item.getparent().remove(item)
+
+  parts = _walk(
+    package,
+    lambda source, part: part not in skipped and (source is not prs or part in targets)
+  )
+  stream = ZipStream(out, compression)
+  stream.write(CONTENT_TYPES_URI, dump_xml(_ContentTypesItem.xml_for(parts)))
+  stream.write(PACKAGE_URI.rels_uri, package.rels.xml)
+  for part in parts:
+    rels = _rels(part, keep)
+    if rels is part.rels and part is not prs:
+      stream.write_part(part)
+      continue
+
+    pruned = element if part is prs else _pruned(part, keep)
+    stream.write(part.partname, pruned, part.content_type)
+    if len(rels):
+      stream.write(part.partname.rels_uri, rels.xml)
+
+  stream.close()
+  return len(slide_ids)
+
+
+def _weak(prs):
+  """
+  Return value: The rIds of the weak relationships of *prs* (a presentation part)
+  - those recorded by |Cloner|, as well as those of explicit types, which its XML
+  doesn't reference (see |Presentation.collect_garbage|).
+  """
+  refs = _references(prs)
+  cache = getattr(prs.package, '_clone_cache', None)
+  related = set(cache.related.values()) if cache is not None else set()
+  return {
+    rId for rId, rel in prs.rels.items()
+    if rId not in refs and (rId in related or _is_explicit(prs, rel))
+  }
+
+
+def _rels(part, keep):
+  """
+  Return value: The relationships of *part* which *keep* accepts - given *part*,
+  their rId and themselves - as a copy, unless these are all of them.
+  """
+  kept = [(rId, rel) for rId, rel in part.rels.items() if keep(part, rId, rel)]
+  if len(kept) == len(part.rels):
+    return part.rels
+
+  rels = Rels(part.partname.baseURI)
+  for rId, rel in kept:
+    rels[rId] = rel
+  return rels
+
+
+def _pruned(part, keep):
+  """
+  Return value: A copy of the element tree of *part* short of all the elements
+  referencing its relationships which *keep* rejects (see |_rels|) - e.g. slide
+  jump hyperlinks, or the *sldIdLst* and custom show items of a presentation.
+  """
+  rels = _rels(part, keep)
+  element = deepcopy(part._element)
+  for item in element.xpath('.//*[@r:id]'):
+    rId = item.get(qn('r:id'))
+    if rId in part.rels and rId not in rels:
+      item.getparent().remove(item)
+
+  return element
@@ -1,30 +1,41 @@
 # encoding: utf-8
 
+import hashlib
 from posixpath import splitext
 from pptx import Presentation as _load
-from .common import lazyproperty, Slides, RT, Cache, Presentation, PresentationPart, PackURI, Slide, Part, Rel
-from .slide import _Slide
+from pptx.opc.package import PartFactory, Unmarshaller
+from pptx.opc.packuri import PACKAGE_URI
+from pptx.package import Package
+from .common import _media, lazyproperty, Slides, RT, CT, Cache, Presentation
+from .common import PresentationPart, PackURI, Slide, Part, Rel
+from .saving import save as _save
+from .slide import _Slide, link_paths
 
 
 class Template:
   def __init__(self, uri):
     self._uri = uri
     self._model = None
+    self._skeleton = None
 
   @property
   def model(self):
     return self._model
 
   def __call__(self):
-    prs = _load(self._uri)     # FIXME: Check _uri existence
-    if self._model is None:
+    if self._skeleton is None:
+      prs = _load(self._uri)     # FIXME: Check _uri existence
       self._model = _Model(prs.slides)
 
-    for node in prs.slide_layouts:
-      node.part.drop_all(RT.SLIDE, recursive=False)
+      for node in prs.slide_layouts:
+        node.part.drop_all(RT.SLIDE, recursive=False)
 
-    prs.part.drop_all(RT.SLIDE, { RT.COMMENT_AUTHORS, RT.PRES_PROPS })
-    prs.slides.clear()    
+      prs.part.drop_all(RT.SLIDE, { RT.COMMENT_AUTHORS, RT.PRES_PROPS })
+      prs.slides.clear()
+      prs.collect_garbage()
+      self._skeleton = _Skeleton(prs.part.package)
+    else:
+      prs = self._skeleton()
 
     return _Presentation(prs.part, self)
 
@@ -45,11 +56,30 @@ class _Presentation(Presentation):
   def model(self):
     return self._source.model
 
-  def save(self, file, update_links=False):  # FIXME: Clean extraneous relationships (including those without corresponding links)
+  # FIXME: Clean extraneous relationships (including those without corresponding links)
+  def save(
+    self, file, update_links=False, stream=False, compression=None, workers=None,
+    collect_garbage=False
+  ):
+    """
+    Saves *self* to *file*; if *stream* is set, parts are serialized and written
+    one at a time, using the per-content-type *compression* levels (see
+    |ZipStream|). Given a number of *workers*, parts are serialized in parallel
+    ahead of being written (which implies *stream*). If
+    *collect_garbage* is set, unreachable parts are dropped once all links are
+    resolved (see |Presentation.collect_garbage|).
+    """
     for slide in self.slides:
       slide._update(self.slides, update_links)
 
-    self.part.save(file)
+    if collect_garbage:
+      self.collect_garbage()
+
+    if stream or workers:
+      _save(self.part.package, file, compression, workers=workers)
+    else:
+      self.part.save(file)
+
     return self
 
   @lazyproperty
@@ -63,6 +93,22 @@ class _Slides(Slides):
   def __init__(self, sldIdLst, prs):
     Slides.__init__(self, sldIdLst, prs)
     self._model = prs.model
+    self._ids = {}
+
+  def get(self, slide_id, default=None):
+    """
+    Return the slide given by *slide_id*, or *default* if there is no such slide;
+    slides created by *self* are resolved in constant time.
+    """
+    slide = self._ids.get(slide_id)
+    if slide is None:
+      return Slides.get(self, slide_id, default)
+
+    if slide._sldId.getparent() is None:
+      del self._ids[slide_id]
+      return default
+
+    return slide
 
   def __call__(self, slide_index=None, slide_id=None, position=None):
     model = self._model
@@ -70,40 +116,136 @@ class _Slides(Slides):
       return
 
     if slide_index is None and slide_id is None:
-      ret = []
-
-      for i in range(len(model)):
-        ret.append(self(i))
-
-      return ret
+      return self.instantiate_many(range(len(model)))
 
     slide_model = model(slide_index, slide_id)
     if slide_model is None:
       return
 
-    ret = slide_model(Cache(self.part.package))
-    rId = self.part.relate_to(ret, RT.SLIDE)
+    return self._instantiate([(slide_model, position)])[0]
 
-    slide_id = self._sldIdLst.add_sldId(rId)
-    slide = _Slide(ret, slide_id)
-    slide.relocate(position)
-    return slide
+  def instantiate_many(self, items):
+    """
+    Creates new slides out of the model slides given by *items*, each being
+    either a key or a ``(key, position)`` pair; *key* denotes a slide index if
+    it is an |int|, otherwise a slide id. All slides are built in a single pass,
+    with their *sldId* entries allocated and placed within *sldIdLst* at once.
 
+    Return value: The list of newly created |_Slide| instances (|None| for every
+    key which cannot be resolved).
+    """
+    model = self._model
+    if model is None:
+      return
+
+    pairs, ret = [], []
+    for item in items:
+      key, position = item if isinstance(item, tuple) else (item, None)
+      if isinstance(key, int):
+        slide_model = model(key)
+      else:
+        slide_model = model(slide_id=int(key))
+
+      ret.append(slide_model)
+      if slide_model is not None:
+        pairs.append((slide_model, position))
+
+    slides = iter(self._instantiate(pairs))
+    return [next(slides) if slide_model is not None else None for slide_model in ret]
+
+  def _instantiate(self, pairs):
+    sldIdLst = self._sldIdLst
+    order = list(sldIdLst)
+    package = self.part.package
+    ids = package.ids
+
+    ret = []
+    for slide_model, position in pairs:
+      # a fresh |Cache| per slide, which thus owns its notes slide, charts etc.
+      part = slide_model(Cache(package))
+
+      sldId = sldIdLst._new_sldId()
+      sldId.id = ids.next_slide_id()
+      sldId.rId = self.part.relate_to(part, RT.SLIDE)
+
+      _place(order, sldId, position)
+      slide = self._ids[sldId.id] = _Slide(part, sldId, slide_model.links)
+      ret.append(slide)
+
+    sldIdLst[:] = order
+    return ret
+
+
+def _place(order, item, position=None):
+  """
+  Appends *item* to *order*, then moves it to *position* (if non-null) - exactly
+  as |_Slide.relocate| would.
+  """
+  order.append(item)
+  if position is None:
+    return
+
+  if position < 0:
+    position += len(order)
+
+  order.insert(position, order.pop())
+
+
+class _Skeleton:
+  """
+  In-memory serialized snapshot of a (slide-less) package, which new |Package|
+  instances are unmarshalled from - without reading the source file again.
+  """
+  def __init__(self, package):
+    self._sparts = []
+    self._srels = [
+      (PACKAGE_URI, _SerializedRelationship(rel)) for rel in package.rels.values()
+    ]
+    for part in package.iter_parts():
+      self._sparts.append((part.partname, part.content_type, part.blob))
+      for rel in part.rels.values():
+        self._srels.append((part.partname, _SerializedRelationship(rel)))
+
+  def iter_sparts(self):
+    return iter(self._sparts)
+
+  def iter_srels(self):
+    return iter(self._srels)
+
+  def __call__(self):
+    """
+    Return value: The |Presentation| of a newly unmarshalled |Package|.
+    """
+    package = Package()
+    Unmarshaller.unmarshal(self, package, _load_lazy)
+    return package.presentation_part.presentation
+
+
+def _load_lazy(partname, content_type, blob, package):
+  cls = PartFactory._part_cls_for(content_type)
+  return cls.load_lazy(partname, content_type, blob, package)
+
+
+class _SerializedRelationship:
+  def __init__(self, rel):
+    self.rId = rel.rId
+    self.reltype = rel.reltype
+    self.is_external = rel.is_external
+    self.target_ref = rel.target_ref
+    self.target_partname = None if rel.is_external else rel.target_part.partname
 
 
 class _Model:
   def __init__(self, slides):
     self._list = _SlideParts(slides, self)
-    self._ids = {}
-
-  def get(self, slide_id):
-    if slide_id not in self._ids:
-      for item in self._list:
-        if item.slide_id == slide_id:
-          self._ids[slide_id] = item
-          break
+    self._ids = { item.slide_id: item for item in self._list }
 
-    return self._ids[slide_id]
+  def get(self, slide_id, default=None):
+    """
+    Return value: The model of the slide given by *slide_id*, or *default* if
+    there is no such slide.
+    """
+    return self._ids.get(slide_id, default)
 
   def __getitem__(self, slide_index):
     return self._list[slide_index]
@@ -117,11 +259,12 @@ class _Model:
   def __call__(self, slide_index=None, slide_id=None):
     """
     Retrieve the |_Slide| instance from the given by either
-    (but not both) *slide_index* or *slide_id*.
+    (but not both) *slide_index* or *slide_id* - |None| if there is no such slide.
     """
     model = None
     if slide_index is not None:
-      model = self[slide_index]
+      if -len(self) <= slide_index < len(self):
+        model = self[slide_index]
     elif slide_id is not None:
       model = self.get(slide_id)
 
@@ -146,6 +289,10 @@ class _Reference:
   def blob(self):
     return self._blob
 
+  @lazyproperty
+  def sha256(self):
+    return hashlib.sha256(self._blob).hexdigest()
+
   @property
   def slide_id(self):
     return self._slide_id
@@ -164,12 +311,23 @@ class _Part(_Reference):
     _Reference.__init__(self, part, owner, slide_id)
     part._model = self
     self._uri = self.partname.template
-    self._load = part.load    
+    self._load = part.load_lazy
+    is_slide = self._content_type == CT.PML_SLIDE
+    self._links = link_paths(part._element) if is_slide else None
     self._rels = _Relationships(part, self)
 
+  @property
+  def links(self):
+    """
+    The paths of the slide jump links within the element tree of *self* (see
+    |link_paths|); |None| unless *self* models a slide.
+    """
+    return self._links
+
   def __call__(self, cache):
     uri = cache.next_partname(self._uri)
     part = self._load(uri, self._content_type, self._blob, cache.package)
+    cache.package.index.add(part)
 
     cache[self] = part
 
@@ -227,5 +385,7 @@ class _Relationship:
 
       if target is None and cache is not None:
         target = cache[self.target]
+        if self.reltype in _media:
+          target = part.package.media.add(target)
 
     return part.load_rel(self.reltype, target, self._rId, self.is_external)